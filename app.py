@@ -2,19 +2,21 @@ import streamlit as st
 from streamlit_option_menu import option_menu
 import plotly.express as px
 import pandas as pd
-from datetime import datetime, timedelta
 import json
+from typing import Dict
 
 # Import our custom modules
-from core.llm_handler import LLMHandler
-from core.vector_store import VectorStore
-from core.paper_processor import PaperProcessor
-from core.citation_manager import CitationManager
+from core.services import Services
+from core.paper_catalog import SORT_ORDERS
+from core.event_log import PAPER_ADDED, CITATION_CREATED, QUERY_MADE, SUMMARY_GENERATED, get_event_log
 from components.chat_interface import ChatInterface
 from components.paper_upload import PaperUpload
 from components.deadline_tracker import DeadlineTracker
 from components.citation_display import CitationDisplay
-from config.settings import APP_TITLE, APP_DESCRIPTION
+from config.settings import APP_TITLE, APP_DESCRIPTION, CHROMA_MODE, CHROMA_HOST, CHROMA_PORT, CHROMA_DB_PATH
+
+# Seconds a sidebar connection check result is reused before the server is pinged again
+STATUS_CHECK_SECONDS = 30
 
 # Page configuration
 st.set_page_config(
@@ -24,29 +26,71 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_data
+def load_css(path: str) -> str:
+    """Read a stylesheet once per process"""
+    with open(path, 'r') as f:
+        return f.read()
+
+
+@st.cache_resource
+def get_services() -> Services:
+    """Clients and stores shared across reruns and sessions"""
+    return Services()
+
+
+@st.cache_resource
+def get_deadline_tracker() -> DeadlineTracker:
+    """Deadline tracker shared across reruns and sessions"""
+    return DeadlineTracker()
+
+
+@st.cache_data(ttl=STATUS_CHECK_SECONDS)
+def check_ollama() -> bool:
+    """Whether the Ollama server responds; rechecked at most every STATUS_CHECK_SECONDS"""
+    try:
+        get_services().llm_handler.client.list()
+        return True
+    except Exception:
+        return False
+
+
+@st.cache_data(ttl=STATUS_CHECK_SECONDS)
+def check_chroma() -> bool:
+    """Whether the Chroma server responds; rechecked at most every STATUS_CHECK_SECONDS"""
+    try:
+        get_services().vector_store.client.heartbeat()
+        return True
+    except Exception:
+        return False
+
+
 # Load external CSS
-with open('static/css/style.css', 'r') as f:
-    css = f.read()
-st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
+st.markdown(f'<style>{load_css("static/css/style.css")}</style>', unsafe_allow_html=True)
 
 
 class ResearchAssistantApp:
     def __init__(self):
-        self.llm_handler = LLMHandler()
-        self.vector_store = VectorStore()
-        self.paper_processor = PaperProcessor()
-        self.citation_manager = CitationManager()
-        self.chat_interface = ChatInterface(self.llm_handler, self.vector_store)
-        self.paper_upload = PaperUpload(self.paper_processor, self.vector_store)
-        self.deadline_tracker = DeadlineTracker()
+        services = get_services()
+        self.llm_handler = services.llm_handler
+        self.vector_store = services.vector_store
+        self.paper_processor = services.paper_processor
+        self.citation_manager = services.citation_manager
+        self.summary_store = services.summary_store
+        self.semantic_cache = services.semantic_cache
+        self.conversation_store = services.conversation_store
+        self.chat_interface = ChatInterface(self.llm_handler, self.vector_store, self.summary_store,
+                                            self.conversation_store, services.conversation_memory,
+                                            self.semantic_cache)
+        self.paper_upload = PaperUpload(services.job_queue, services.job_workers, services.paper_jobs)
+        self.deadline_tracker = get_deadline_tracker()
         self.citation_display = CitationDisplay(self.citation_manager)
 
         self._initialize_session_state()
 
     def _initialize_session_state(self):
         """Initialize session state variables"""
-        if 'chat_history' not in st.session_state:
-            st.session_state.chat_history = []
         if 'uploaded_papers' not in st.session_state:
             st.session_state.uploaded_papers = []
         if 'deadlines' not in st.session_state:
@@ -69,7 +113,7 @@ class ResearchAssistantApp:
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            papers_count = len(self.vector_store.get_all_papers())
+            papers_count = self.vector_store.count()
             st.metric("📄 Papers", papers_count)
 
         with col2:
@@ -81,23 +125,22 @@ class ResearchAssistantApp:
             st.metric("⏰ Deadlines", deadlines_count)
 
         with col4:
-            chat_count = len(st.session_state.chat_history)
+            chat_count = self.conversation_store.count()
             st.metric("💬 Conversations", chat_count)
 
         # Recent activity
         st.subheader("📈 Recent Activity")
 
-        # Create sample data for visualization
-        activity_data = {
-            'Date': [datetime.now() - timedelta(days=i) for i in range(7)],
-            'Papers Added': [2, 1, 3, 0, 2, 1, 1],
-            'Citations Created': [1, 2, 1, 1, 0, 2, 1],
-            'Queries Made': [5, 3, 7, 2, 4, 6, 3]
-        }
+        # Daily rollups keep this to a handful of rows however many events have been logged
+        df = pd.DataFrame([{
+            'Date': day['day'],
+            'Papers Added': day['events'].get(PAPER_ADDED, {}).get('count', 0),
+            'Citations Created': day['events'].get(CITATION_CREATED, {}).get('count', 0),
+            'Queries Made': day['events'].get(QUERY_MADE, {}).get('count', 0),
+            'Summaries Generated': day['events'].get(SUMMARY_GENERATED, {}).get('count', 0)
+        } for day in get_event_log().daily_counts(days=7)])
 
-        df = pd.DataFrame(activity_data)
-
-        fig = px.line(df, x='Date', y=['Papers Added', 'Citations Created', 'Queries Made'],
+        fig = px.line(df, x='Date', y=['Papers Added', 'Citations Created', 'Queries Made', 'Summaries Generated'],
                       title="Weekly Research Activity")
         st.plotly_chart(fig, use_container_width=True)
 
@@ -110,7 +153,7 @@ class ResearchAssistantApp:
         """Render the papers management interface"""
         st.header("📄 Paper Management")
 
-        tab1, tab2 = st.tabs(["Upload Papers", "Manage Papers"])
+        tab1, tab2, tab3 = st.tabs(["Upload Papers", "Manage Papers", "Research Directions"])
 
         with tab1:
             self.paper_upload.render()
@@ -118,46 +161,131 @@ class ResearchAssistantApp:
         with tab2:
             self._render_paper_management()
 
-    def _render_paper_management(self):
-        """Render paper management interface"""
-        papers = self.vector_store.get_all_papers()
+        with tab3:
+            self._render_research_directions()
 
-        if not papers:
+    def _render_research_directions(self):
+        """Suggest research directions from the summaries of papers related to a topic"""
+        topic = st.text_input("Research topic", placeholder="e.g., cold start mitigation in serverless computing")
+
+        if st.button("🔭 Suggest Directions") and topic:
+            with st.spinner("Thinking about research directions..."):
+                papers = self.vector_store.search_papers(topic, n_results=5)
+                summaries = self.summary_store.get_many([paper['id'] for paper in papers])
+                current_papers = [
+                    f"{paper['metadata'].get('title', paper['id'])}: "
+                    + (summaries[paper['id']]['summary'] if paper['id'] in summaries else paper['content'])
+                    for paper in papers
+                ]
+                directions = self.llm_handler.suggest_research_directions(topic, current_papers)
+
+            st.write("**Suggested Directions:**")
+            st.write("\n".join(directions))
+
+    def _render_paper_management(self):
+        """Render a searchable, paginated paper list with details loaded only for the selected paper"""
+        self.vector_store.sync_local_indexes()
+        catalog = self.vector_store.catalog
+        if catalog.count() == 0:
             st.info("No papers uploaded yet. Use the 'Upload Papers' tab to add papers.")
             return
 
         st.subheader("📚 Your Research Papers")
 
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            search = st.text_input("Search", placeholder="Title or filename", key="papers_search")
+        with col2:
+            sort = st.selectbox("Sort by", list(SORT_ORDERS), key="papers_sort")
+        with col3:
+            page_size = st.selectbox("Per page", [10, 20, 50], index=1, key="papers_page_size")
+
+        # Start from the first page whenever the filter changes
+        filter_key = (search, sort, page_size)
+        if st.session_state.get('papers_filter') != filter_key:
+            st.session_state.papers_filter = filter_key
+            st.session_state.papers_page = 0
+
+        total = catalog.count(search)
+        page_count = max(1, -(-total // page_size))
+        page = min(st.session_state.papers_page, page_count - 1)
+        papers = catalog.page(search, sort, offset=page * page_size, limit=page_size)
+
+        if not papers:
+            st.info("No papers match your search.")
+            return
+
         for paper in papers:
-            with st.expander(f"📄 {paper['metadata'].get('title', paper['id'])}"):
-                col1, col2 = st.columns([3, 1])
-
-                with col1:
-                    st.write(f"**ID:** {paper['id']}")
-                    st.write(f"**Word Count:** {paper['metadata'].get('word_count', 'N/A')}")
-                    st.write(f"**Processed:** {paper['metadata'].get('processed_at', 'N/A')}")
-
-                    # Show first 200 characters of content
-                    content_preview = paper['content'][:200] + "..." if len(paper['content']) > 200 else paper[
-                        'content']
-                    st.text_area("Preview", content_preview, height=100, disabled=True)
-
-                with col2:
-                    if st.button(f"🗑️ Delete", key=f"delete_{paper['id']}"):
-                        if self.vector_store.delete_paper(paper['id']):
-                            st.success("Paper deleted successfully!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to delete paper")
-
-                    if st.button(f"📝 Summarize", key=f"summarize_{paper['id']}"):
-                        with st.spinner("Generating summary..."):
-                            summary = self.llm_handler.summarize_paper(
-                                paper['content'],
-                                paper['metadata'].get('title', '')
-                            )
-                            st.write("**Summary:**")
-                            st.write(summary['summary'])
+            col1, col2, col3 = st.columns([4, 1, 1])
+            with col1:
+                st.write(f"📄 **{paper['metadata'].get('title', paper['id'])}**")
+            with col2:
+                st.caption(f"{paper['metadata'].get('word_count', 'N/A')} words")
+            with col3:
+                if st.button("Details", key=f"details_{paper['id']}"):
+                    st.session_state.selected_paper = paper['id']
+
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("◀ Previous", disabled=page == 0):
+                st.session_state.papers_page = page - 1
+                st.rerun()
+        with col2:
+            st.caption(f"Page {page + 1} of {page_count} ({total} papers)")
+        with col3:
+            if st.button("Next ▶", disabled=page >= page_count - 1):
+                st.session_state.papers_page = page + 1
+                st.rerun()
+
+        selected = next((paper for paper in papers if paper['id'] == st.session_state.get('selected_paper')), None)
+        if selected is not None:
+            self._render_paper_details(selected)
+
+    def _render_paper_details(self, paper: Dict):
+        """Show the stored summary and actions for one paper; content is only fetched when needed"""
+        st.markdown("---")
+        st.subheader(f"📄 {paper['metadata'].get('title', paper['id'])}")
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            st.write(f"**ID:** {paper['id']}")
+            st.write(f"**Word Count:** {paper['metadata'].get('word_count', 'N/A')}")
+            st.write(f"**Processed:** {paper['metadata'].get('processed_at', 'N/A')}")
+
+            stored = self.summary_store.get(paper['id'])
+            if stored is not None:
+                st.write(f"**Summary** ({stored['model']}, {stored['generated_at'][:10]}):")
+                st.write(stored['summary'])
+
+            if st.button("👁️ Preview", key=f"preview_{paper['id']}"):
+                content = self.vector_store.get_paper_content(paper['id'])
+                content_preview = content[:200] + "..." if len(content) > 200 else content
+                st.text_area("Preview", content_preview, height=100, disabled=True)
+
+        with col2:
+            if st.button(f"🗑️ Delete", key=f"delete_{paper['id']}"):
+                if self.vector_store.delete_paper(paper['id']):
+                    self.summary_store.delete(paper['id'])
+                    st.session_state.selected_paper = None
+                    st.success("Paper deleted successfully!")
+                    st.rerun()
+                else:
+                    st.error("Failed to delete paper")
+
+            summarize = st.button(f"📝 Summarize", key=f"summarize_{paper['id']}")
+            regenerate = st.button(f"🔄 Regenerate", key=f"regenerate_{paper['id']}",
+                                   help="Ignore the cached summary and run the model again")
+            if summarize or regenerate:
+                with st.spinner("Generating summary..."):
+                    summary = self.llm_handler.summarize_paper(
+                        self.vector_store.get_paper_content(paper['id']),
+                        paper['metadata'].get('title', ''),
+                        use_cache=not regenerate
+                    )
+                if summary['success']:
+                    self.summary_store.save(paper['id'], summary)
+                    st.rerun()
+                st.error(summary['summary'])
 
     def render_citations(self):
         """Render the citations management interface"""
@@ -182,8 +310,71 @@ class ResearchAssistantApp:
             st.text_input("Ollama URL", value="http://localhost:11434", disabled=True)
 
         with col2:
-            st.text_input("ChromaDB Host", value="localhost", disabled=True)
-            st.text_input("ChromaDB Port", value="8000", disabled=True)
+            st.text_input("ChromaDB Mode", value=CHROMA_MODE, disabled=True)
+            if CHROMA_MODE == "persistent":
+                st.text_input("ChromaDB Path", value=CHROMA_DB_PATH, disabled=True)
+            else:
+                st.text_input("ChromaDB Host", value=CHROMA_HOST, disabled=True)
+                st.text_input("ChromaDB Port", value=str(CHROMA_PORT), disabled=True)
+
+        st.subheader("📈 Performance")
+
+        cache_stats = self.vector_store.cache_stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Query Cache Hits", cache_stats['hits'])
+        col2.metric("Query Cache Misses", cache_stats['misses'])
+        col3.metric("Query Cache Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+
+        llm_cache_stats = self.llm_handler.cache_stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("LLM Cache Entries", llm_cache_stats['entries'])
+        col2.metric("LLM Cache Size", f"{llm_cache_stats['bytes'] / (1024 * 1024):.1f} MB")
+        col3.metric("LLM Cache Hit Rate", f"{llm_cache_stats['hit_rate']:.0%}")
+
+        semantic_cache_stats = self.semantic_cache.stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Semantic Cache Entries", semantic_cache_stats['entries'])
+        col2.metric("Semantic Cache Hits", semantic_cache_stats['hits'])
+        col3.metric("Semantic Cache Hit Rate", f"{semantic_cache_stats['hit_rate']:.0%}")
+
+        st.write("**Model Routes**")
+        st.dataframe(pd.DataFrame([
+            {
+                'Task': task,
+                'Model': stats['model'],
+                'Calls': stats['calls'],
+                'Avg Latency (s)': round(stats['avg_seconds'], 2),
+                'Max Latency (s)': round(stats['max_seconds'], 2)
+            }
+            for task, stats in self.llm_handler.route_stats().items()
+        ]), use_container_width=True)
+
+        st.write("**LLM Throughput**")
+        metrics_summary = self.llm_handler.metrics.summary()
+        if metrics_summary:
+            st.dataframe(pd.DataFrame([
+                {
+                    'Model': row['model'],
+                    'Task': row['task'],
+                    'Calls': row['calls'],
+                    'Tokens/s': round(row['avg_tokens_per_second'], 1),
+                    'Avg TTFT (s)': round(row['avg_ttft_seconds'], 2),
+                    'Max TTFT (s)': round(row['max_ttft_seconds'], 2),
+                    'Avg Prompt Tokens': round(row['avg_prompt_tokens']),
+                    'Avg Output Tokens': round(row['avg_eval_tokens']),
+                    'Avg Load (s)': round(row['avg_load_seconds'], 2),
+                    'Max Load (s)': round(row['max_load_seconds'], 2)
+                }
+                for row in metrics_summary
+            ]), use_container_width=True)
+            st.download_button(
+                "Download LLM Metrics (CSV)",
+                self.llm_handler.metrics.to_csv(),
+                "llm_metrics.csv",
+                "text/csv"
+            )
+        else:
+            st.caption("No model calls recorded yet.")
 
         st.subheader("🔧 Application Settings")
 
@@ -207,7 +398,7 @@ class ResearchAssistantApp:
 
         with col2:
             if st.button("Export Chat History"):
-                chat_json = json.dumps(st.session_state.chat_history, indent=2)
+                chat_json = json.dumps(self.conversation_store.export(), indent=2)
                 st.download_button(
                     "Download Chat History",
                     chat_json,
@@ -217,7 +408,7 @@ class ResearchAssistantApp:
 
         with col3:
             if st.button("Export Papers List"):
-                papers = self.vector_store.get_all_papers()
+                papers = self.vector_store.list_papers(limit=self.vector_store.count())
                 papers_df = pd.DataFrame([{
                     'id': p['id'],
                     'title': p['metadata'].get('title', ''),
@@ -259,17 +450,15 @@ class ResearchAssistantApp:
             st.markdown("**🔧 System Status**")
 
             # Check Ollama connection
-            try:
-                self.llm_handler.client.list()
+            if check_ollama():
                 st.success("🤖 Ollama: Connected")
-            except:
+            else:
                 st.error("🤖 Ollama: Disconnected")
 
             # Check ChromaDB connection
-            try:
-                self.vector_store.client.heartbeat()
+            if check_chroma():
                 st.success("🗄️ ChromaDB: Connected")
-            except:
+            else:
                 st.error("🗄️ ChromaDB: Disconnected")
 
         # Main content area
@@ -1,59 +1,71 @@
+import asyncio
 import streamlit as st
+import time
 from typing import Dict
-import uuid
 from datetime import datetime
+from config.settings import SEMANTIC_CACHE_ENABLED
+from core.async_clients import AsyncLLMHandler, AsyncVectorStore, recall_and_retrieve
+from core.context_builder import ContextBuilder
+from core.event_log import QUERY_MADE, get_event_log
+from core.llm_handler import ERROR_PREFIX, PROMPT_TEMPLATE_VERSION
 
 
-def _display_message(message: Dict):
-    """Display a chat message"""
-    if message['role'] == 'user':
-        st.markdown(f"""
+def _message_html(role: str, content: str) -> str:
+    """Build the HTML for a chat message bubble"""
+    if role == 'user':
+        return f"""
         <div class="chat-message user-message">
             <strong>🧑‍💼 You:</strong><br>
-            {message['content']}
+            {content}
         </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
+        """
+    return f"""
         <div class="chat-message assistant-message">
             <strong>🤖 Assistant:</strong><br>
-            {message['content']}
+            {content}
         </div>
-        """, unsafe_allow_html=True)
-
-        if 'sources' in message:
-            with st.expander("📚 Sources"):
-                for source in message['sources']:
-                    st.write(f"• **{source['title']}** (Distance: {source['distance']:.3f})")
-
-
-def _save_conversation():
-    """Save current conversation to history"""
-    if len(st.session_state.current_conversation) >= 2:  # At least one exchange
-        conversation_id = str(uuid.uuid4())
-        title = st.session_state.current_conversation[0]['content'][:50]
+        """
 
-        conversation = {
-            'id': conversation_id,
-            'title': title,
-            'messages': st.session_state.current_conversation.copy(),
-            'created_at': datetime.now().isoformat()
-        }
 
-        st.session_state.chat_history.append(conversation)
-        if len(st.session_state.chat_history) > 50:
-            st.session_state.chat_history.pop(0)
+def _display_message(message: Dict):
+    """Display a chat message"""
+    st.markdown(_message_html(message['role'], message['content']), unsafe_allow_html=True)
+
+    if message.get('cached'):
+        st.caption(f"♻️ Cached answer (similarity {message['cached']['similarity']:.2f} to "
+                   f"\"{message['cached']['question'][:80]}\")")
+
+    if message['role'] != 'user' and 'sources' in message:
+        with st.expander("📚 Sources"):
+            for source in message['sources']:
+                if source['distance'] is None:
+                    st.write(f"• **{source['title']}** (keyword match)")
+                else:
+                    st.write(f"• **{source['title']}** (Distance: {source['distance']:.3f})")
+            stats = message.get('context_stats')
+            if stats:
+                st.caption(
+                    f"Context: {stats['used_tokens']}/{stats['budget']} tokens "
+                    f"({stats['chunks_used']} passages, {stats['chunks_dropped']} dropped, "
+                    f"{stats['duplicates_skipped']} duplicates skipped)"
+                )
 
 
 class ChatInterface:
-    def __init__(self, llm_handler, vector_store):
+    def __init__(self, llm_handler, vector_store, summary_store, conversation_store, conversation_memory,
+                 semantic_cache=None):
         self.llm_handler = llm_handler
         self.vector_store = vector_store
+        self.summary_store = summary_store
+        self.conversation_store = conversation_store
+        self.conversation_memory = conversation_memory
+        self.semantic_cache = semantic_cache
+        # Let retrieval overlap history compaction and bound each answer with a timeout
+        self.async_llm = AsyncLLMHandler(llm_handler)
+        self.async_vector_store = AsyncVectorStore(vector_store)
 
-        if 'chat_history' not in st.session_state:
-            st.session_state.chat_history = []
-        if 'current_conversation' not in st.session_state:
-            st.session_state.current_conversation = []
+        if 'conversation_id' not in st.session_state:
+            st.session_state.conversation_id = None
 
     def render(self):
         """Render the chat interface"""
@@ -61,12 +73,12 @@ class ChatInterface:
         with st.sidebar:
             st.subheader("💬 Chat History")
             if st.button("🆕 New Conversation"):
-                st.session_state.current_conversation = []
+                st.session_state.conversation_id = None
                 st.rerun()
 
-            for i, chat in enumerate(st.session_state.chat_history[-10:]):
-                if st.button(f"Chat {i + 1}: {chat['title'][:20]}...", key=f"chat_{i}"):
-                    st.session_state.current_conversation = chat['messages']
+            for i, chat in enumerate(self.conversation_store.recent(limit=10)):
+                if st.button(f"Chat {i + 1}: {chat['title'][:20]}...", key=f"chat_{chat['id']}"):
+                    st.session_state.conversation_id = chat['id']
                     st.rerun()
 
         st.subheader("🤖 Research Assistant Chat")
@@ -74,8 +86,9 @@ class ChatInterface:
         chat_container = st.container()
 
         with chat_container:
-            for message in st.session_state.current_conversation:
-                _display_message(message)
+            if st.session_state.conversation_id is not None:
+                for message in self.conversation_store.messages(st.session_state.conversation_id):
+                    _display_message(message)
 
         with st.form(key="chat_form", clear_on_submit=True):
             col1, col2 = st.columns([4, 1])
@@ -91,50 +104,101 @@ class ChatInterface:
             with col2:
                 st.write("")  # Spacing
                 use_rag = st.checkbox("Use RAG", value=True, help="Search your papers for relevant context")
+                use_cached = st.checkbox(
+                    "Reuse similar answers", value=SEMANTIC_CACHE_ENABLED,
+                    disabled=self.semantic_cache is None,
+                    help="Answer near-duplicate questions about the same papers from earlier answers"
+                )
                 submit_button = st.form_submit_button("Send 🚀")
 
         if submit_button and user_input:
-            self._process_user_input(user_input, use_rag)
+            self._process_user_input(user_input, use_rag, use_cached and self.semantic_cache is not None)
 
-    def _process_user_input(self, user_input: str, use_rag: bool):
+    def _process_user_input(self, user_input: str, use_rag: bool, use_cached: bool = False):
         """Process user input and generate response"""
+        started = time.perf_counter()
+        # Earlier turns, compacted to fit the history budget, let follow-up questions refer back
+        conversation_id = st.session_state.conversation_id
+        new_conversation = conversation_id is None
+        if new_conversation:
+            conversation_id = self.conversation_store.create(user_input[:50])
+            st.session_state.conversation_id = conversation_id
+
         user_message = {
             'role': 'user',
             'content': user_input,
             'timestamp': datetime.now().isoformat()
         }
-        st.session_state.current_conversation.append(user_message)
-
-        with st.spinner("🤔 Thinking..."):
-            context = ""
-            sources = []
-
-            if use_rag:
-                # Search for relevant papers
-                relevant_papers = self.vector_store.search_papers(user_input, n_results=3)
-
-                if relevant_papers:
-                    context = "\n\n".join([
-                        f"Paper: {paper['metadata'].get('title', 'Unknown')}\n{paper['content'][:500]}..."
-                        for paper in relevant_papers
-                    ])
-
-                    sources = [{
-                        'title': paper['metadata'].get('title', paper['id']),
-                        'distance': paper['distance']
-                    } for paper in relevant_papers]
-
-            response = self.llm_handler.generate_response(user_input, context)
-
-            assistant_message = {
-                'role': 'assistant',
-                'content': response,
-                'timestamp': datetime.now().isoformat(),
-                'sources': sources
-            }
-            st.session_state.current_conversation.append(assistant_message)
-
-            _save_conversation()
-
-            st.rerun()
-
+        _display_message(user_message)
+
+        context = ""
+        sources = []
+        context_stats = None
+
+        with st.spinner("🔍 Searching your papers..." if use_rag else "📜 Recalling the conversation..."):
+            # History is read before this question is stored so it only covers earlier turns
+            history, relevant_papers = asyncio.run(recall_and_retrieve(
+                self.conversation_memory, self.async_vector_store, None if new_conversation else conversation_id,
+                user_input, n_results=5, use_rag=use_rag
+            ))
+        self.conversation_store.append(conversation_id, user_message)
+
+        if relevant_papers:
+            # Stored summaries are compact context when a question spans several papers
+            summaries = self.summary_store.get_many([paper['id'] for paper in relevant_papers]) \
+                if len(relevant_papers) > 1 else {}
+            context, context_stats = ContextBuilder.for_model(self.llm_handler.model_name).build(
+                relevant_papers, summaries
+            )
+
+            sources = [{
+                'title': paper['metadata'].get('title', paper['id']),
+                'distance': paper['distance']
+            } for paper in relevant_papers]
+
+        # Answers depend on the question, the retrieved papers, the model and the collection contents;
+        # follow-up questions also depend on the conversation, so only opening questions are cached
+        use_cached = use_cached and not history
+        cached = None
+        if use_cached:
+            scope = self.semantic_cache.scope_key(
+                [paper['id'] for paper in relevant_papers], self.llm_handler.model_name, PROMPT_TEMPLATE_VERSION
+            )
+            generation = self.vector_store.generation
+            cached = self.semantic_cache.lookup(user_input, scope, generation)
+
+        if cached is not None:
+            response = cached['answer']
+        else:
+            # Render tokens as they arrive so the first token, not the full answer, sets the wait
+            placeholder = st.empty()
+            placeholder.markdown(_message_html('assistant', "🤔 Thinking..."), unsafe_allow_html=True)
+            response = asyncio.run(self._stream_answer(placeholder, user_input, context, history))
+
+            if use_cached and not response.startswith(ERROR_PREFIX):
+                self.semantic_cache.store(user_input, response, scope, generation)
+
+        assistant_message = {
+            'role': 'assistant',
+            'content': response,
+            'timestamp': datetime.now().isoformat(),
+            'sources': sources,
+            'context_stats': context_stats,
+            'cached': {'question': cached['question'], 'similarity': cached['similarity']} if cached else None,
+            # Kept so the chat shows what went wrong, but left out of the history sent with later questions
+            'error': response.startswith(ERROR_PREFIX)
+        }
+        self.conversation_store.append(conversation_id, assistant_message)
+        # Counted here rather than in the LLM handler so semantic-cache hits count as questions too
+        get_event_log().record(QUERY_MADE, duration_seconds=time.perf_counter() - started,
+                               cached=cached is not None)
+
+        st.rerun()
+
+    async def _stream_answer(self, placeholder, user_input: str, context: str, history: str) -> str:
+        """Stream the answer into the placeholder and return the full text"""
+        response = ""
+        async for piece in self.async_llm.stream_response(user_input, context, history=history):
+            response += piece
+            placeholder.markdown(_message_html('assistant', response + " ▌"), unsafe_allow_html=True)
+        return response
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import json
+import threading
 from pathlib import Path
 from config.settings import DEADLINES_DIR
 
@@ -9,6 +10,8 @@ from config.settings import DEADLINES_DIR
 class DeadlineTracker:
     def __init__(self):
         self.deadlines_file = DEADLINES_DIR / "deadlines.json"
+        # One instance is shared by all app sessions; serialize changes to the list and file
+        self._lock = threading.Lock()
         self.deadlines = self._load_deadlines()
 
     def _load_deadlines(self):
@@ -69,8 +72,9 @@ class DeadlineTracker:
                         'completed': False
                     }
 
-                    self.deadlines.append(deadline)
-                    self._save_deadlines()
+                    with self._lock:
+                        self.deadlines.append(deadline)
+                        self._save_deadlines()
                     st.success("Deadline added successfully!")
                     st.rerun()
                 else:
@@ -188,13 +192,14 @@ class DeadlineTracker:
 
     def _complete_deadline(self, deadline_id):
         """Mark deadline as completed"""
-        for deadline in self.deadlines:
-            if deadline['id'] == deadline_id:
-                deadline['completed'] = True
-                deadline['completed_at'] = datetime.now().isoformat()
-                break
-
-        self._save_deadlines()
+        with self._lock:
+            for deadline in self.deadlines:
+                if deadline['id'] == deadline_id:
+                    deadline['completed'] = True
+                    deadline['completed_at'] = datetime.now().isoformat()
+                    break
+
+            self._save_deadlines()
         st.success("Deadline marked as completed!")
         st.rerun()
 
@@ -204,7 +209,8 @@ class DeadlineTracker:
 
     def _delete_deadline(self, deadline_id):
         """Delete deadline"""
-        self.deadlines = [d for d in self.deadlines if d['id'] != deadline_id]
-        self._save_deadlines()
+        with self._lock:
+            self.deadlines = [d for d in self.deadlines if d['id'] != deadline_id]
+            self._save_deadlines()
         st.success("Deadline deleted successfully!")
         st.rerun()
\ No newline at end of file
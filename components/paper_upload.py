@@ -1,55 +1,17 @@
 import streamlit as st
 from typing import List
-import os
-from config.settings import MAX_FILE_SIZE, SUPPORTED_FORMATS
+from config.settings import MAX_FILE_SIZE, SUPPORTED_FORMATS, JOB_UI_REFRESH_SECONDS
+from core.job_queue import QUEUED, RUNNING, DONE, FAILED
+from core.paper_jobs import PROCESS_PAPER
 
-
-def _generate_summary(paper_result: dict) -> dict | None:
-    """Generate summary for processed paper"""
-    try:
-        from core.llm_handler import LLMHandler
-        llm = LLMHandler()
-        return llm.summarize_paper(paper_result['content'], paper_result['title'])
-    except Exception as e:
-        st.error(f"Failed to generate summary: {str(e)}")
-        return None
-
-
-def _extract_citations(paper_result: dict) -> List[dict]:
-    """Extract citations from processed paper"""
-    try:
-        # Simple citation extraction (can be enhanced with NLP)
-        content = paper_result['content']
-        citations = []
-
-        # Look for common citation patterns
-        import re
-
-        # Pattern for year citations like (Author, 2020)
-        citation_patterns = [
-            r'\([A-Z][a-zA-Z\s&,]+,\s*\d{4}\)',  # (Author, 2020)
-            r'\[[A-Z][a-zA-Z\s&,]+,\s*\d{4}\]',  # [Author, 2020]
-        ]
-
-        for pattern in citation_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                citations.append({
-                    'raw_text': match,
-                    'extracted_from': paper_result['title']
-                })
-
-        return citations[:10]  # Limit to first 10 citations
-
-    except Exception as e:
-        st.error(f"Failed to extract citations: {str(e)}")
-        return []
+STATUS_ICONS = {QUEUED: "⏳", RUNNING: "⚙️", DONE: "✅", FAILED: "❌"}
 
 
 class PaperUpload:
-    def __init__(self, paper_processor, vector_store):
-        self.paper_processor = paper_processor
-        self.vector_store = vector_store
+    def __init__(self, job_queue, job_workers, paper_jobs):
+        self.job_queue = job_queue
+        self.job_workers = job_workers
+        self.paper_jobs = paper_jobs
 
     def render(self):
         """Render the paper upload interface"""
@@ -99,77 +61,65 @@ class PaperUpload:
             if st.button("🚀 Process All Files"):
                 self._process_files(uploaded_files, auto_extract_citations, generate_summaries)
 
-    def _process_files(self, files: List, auto_extract_citations: bool, generate_summaries: bool):
-        """Process uploaded files"""
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-
-        processed_count = 0
-        total_files = len(files)
-
-        for i, file in enumerate(files):
-            status_text.text(f"Processing {file.name}...")
+        self._render_jobs()
 
-            # Check file size
-            if len(file.getvalue()) > MAX_FILE_SIZE:
+    def _process_files(self, files: List, auto_extract_citations: bool, generate_summaries: bool):
+        """Queue uploaded files for background processing"""
+        queued = 0
+        for file in files:
+            data = file.getvalue()
+            if len(data) > MAX_FILE_SIZE:
                 st.error(f"❌ {file.name}: File too large (max {MAX_FILE_SIZE // (1024 * 1024)}MB)")
                 continue
 
-            # Process file
             try:
-                result = self.paper_processor.process_uploaded_file(file)
-
-                if result['success']:
-                    # Add to vector store
-                    success = self.vector_store.add_paper(
-                        result['id'],
-                        result['content'],
-                        result['metadata']
-                    )
-
-                    if success:
-                        processed_count += 1
-                        st.success(f"✅ {file.name}: Processed successfully")
-
-                        # Add to session state
-                        if 'uploaded_papers' not in st.session_state:
-                            st.session_state.uploaded_papers = []
-
-                        st.session_state.uploaded_papers.append({
-                            'id': result['id'],
-                            'title': result['title'],
-                            'filename': file.name,
-                            'processed_at': result['metadata']['processed_at']
-                        })
-
-                        # Generate summary if requested
-                        if generate_summaries:
-                            with st.spinner(f"Generating summary for {file.name}..."):
-                                summary = _generate_summary(result)
-                                if summary:
-                                    st.info(f"📝 Summary generated for {file.name}")
-
-                        # Extract citations if requested
-                        if auto_extract_citations:
-                            with st.spinner(f"Extracting citations from {file.name}..."):
-                                citations = _extract_citations(result)
-                                if citations:
-                                    st.info(f"📚 {len(citations)} citations extracted from {file.name}")
-
-                    else:
-                        st.error(f"❌ {file.name}: Failed to add to vector store")
-
-                else:
-                    st.error(f"❌ {file.name}: {result['error']}")
-
-            except Exception as e:
+                payload = self.paper_jobs.stage_upload(file.name, data)
+            except (IOError, OSError) as e:
                 st.error(f"❌ {file.name}: {str(e)}")
-
-            # Update progress
-            progress_bar.progress((i + 1) / total_files)
-
-        # Final status
-        status_text.text(f"✅ Processing complete! {processed_count}/{total_files} files processed successfully.")
-
-        if processed_count > 0:
-            st.balloons()
+                continue
+            payload['extract_citations'] = auto_extract_citations
+            payload['generate_summary'] = generate_summaries
+            self.job_queue.enqueue(PROCESS_PAPER, payload, label=file.name)
+            queued += 1
+
+        if queued:
+            self.job_workers.notify()
+            st.success(f"🚀 Queued {queued} files. Processing continues in the background.")
+
+    @st.fragment(run_every=JOB_UI_REFRESH_SECONDS)
+    def _render_jobs(self):
+        """Show recent processing jobs; only this panel reruns on the refresh interval"""
+        jobs = self.job_queue.recent()
+        if not jobs:
+            return
+
+        st.subheader("⚙️ Processing Jobs")
+        for job in jobs:
+            col1, col2 = st.columns([3, 2])
+            with col1:
+                st.write(f"{STATUS_ICONS.get(job['status'], '')} {job['label']}")
+            with col2:
+                if job['status'] == RUNNING:
+                    st.progress(job['progress'], text=job['message'] or None)
+                elif job['status'] == QUEUED:
+                    st.caption(f"Queued (attempt {job['attempts'] + 1})" if job['attempts'] else "Queued")
+                elif job['status'] == DONE:
+                    st.caption(self._describe_result(job['result']))
+                else:
+                    st.caption(f"Failed after {job['attempts']} attempts: {job['error']}")
+                    if st.button("Retry", key=f"retry_{job['id']}"):
+                        self.job_queue.retry(job['id'])
+                        self.job_workers.notify()
+                        st.rerun(scope="fragment")
+
+    @staticmethod
+    def _describe_result(result: dict) -> str:
+        """One-line summary of a finished job"""
+        parts = ["Already processed" if result['cached'] else f"{result['pages']} pages"]
+        if result['summary'] == 'generated':
+            parts.append("summary generated")
+        elif result['summary']:
+            parts.append(f"summary failed: {result['summary']}")
+        if result['citations'] is not None:
+            parts.append(f"{result['citations']} citations")
+        return ", ".join(parts)
@@ -11,18 +11,90 @@ DATA_DIR = BASE_DIR / config["paths"]["data_dir"]
 PAPERS_DIR = BASE_DIR / config["paths"]["papers_dir"]
 CITATIONS_DIR = BASE_DIR / config["paths"]["citations_dir"]
 DEADLINES_DIR = BASE_DIR / config["paths"]["deadlines_dir"]
+INGEST_CACHE_DIR = BASE_DIR / config["paths"]["ingest_cache_dir"]
+SUMMARIES_DIR = BASE_DIR / config["paths"]["summaries_dir"]
+INGEST_MANIFEST_PATH = BASE_DIR / config["paths"]["ingest_manifest"]
+BM25_INDEX_PATH = BASE_DIR / config["paths"]["bm25_index"]
+LLM_CACHE_PATH = BASE_DIR / config["paths"]["llm_cache"]
+LLM_METRICS_PATH = BASE_DIR / config["paths"]["llm_metrics"]
+JOB_QUEUE_PATH = BASE_DIR / config["paths"]["job_queue"]
+EVENT_LOG_PATH = BASE_DIR / config["paths"]["event_log"]
+PAPER_CATALOG_PATH = BASE_DIR / config["paths"]["paper_catalog"]
+CONVERSATIONS_PATH = BASE_DIR / config["paths"]["conversations"]
 
-for dir_path in [DATA_DIR, PAPERS_DIR, CITATIONS_DIR, DEADLINES_DIR]:
+for dir_path in [DATA_DIR, PAPERS_DIR, CITATIONS_DIR, DEADLINES_DIR, INGEST_CACHE_DIR, SUMMARIES_DIR]:
     dir_path.mkdir(exist_ok=True)
 
 # LLM Configuration
 OLLAMA_BASE_URL = config["llm"]["ollama_base_url"]
 MODEL_NAME = config["llm"]["model_name"]
+LLM_PARALLEL_REQUESTS = config["llm"]["parallel_requests"]
+LLM_TASKS = ["chat", "summarize_chunk", "summarize_reduce", "directions"]
+LLM_ROUTES = {
+    task: {
+        "model": config["llm"].get("routes", {}).get(task, {}).get("model") or MODEL_NAME,
+        "options": config["llm"].get("routes", {}).get(task, {}).get("options", {})
+    }
+    for task in LLM_TASKS
+}
+LLM_REQUEST_TIMEOUT = config["llm"]["request_timeout"]
+KEEP_ALIVE = config["llm"]["keep_alive"]
+WARM_UP_ON_START = config["llm"]["warm_up_on_start"]
+KEEP_WARM_INTERVAL = config["llm"]["keep_warm_interval"]
+LLM_METRICS_MAX_RECORDS = config["llm"]["metrics_max_records"]
+
+# Summarization Configuration
+SUMMARY_DIRECT_MAX_TOKENS = config["summarization"]["direct_max_tokens"]
+SUMMARY_CHUNK_TOKENS = config["summarization"]["chunk_tokens"]
+SUMMARY_PARALLELISM = config["summarization"]["parallelism"]
 
 # ChromaDB Configuration
+CHROMA_MODE = config["chroma"]["mode"]
 CHROMA_HOST = config["chroma"]["host"]
 CHROMA_PORT = config["chroma"]["port"]
 CHROMA_DB_PATH = str(BASE_DIR / config["chroma"]["db_path"])
+CHROMA_BATCH_SIZE = config["chroma"]["batch_size"]
+CHROMA_BATCH_BYTES = config["chroma"]["batch_bytes"]
+CHROMA_MAX_RETRIES = config["chroma"]["max_retries"]
+CHROMA_REQUEST_TIMEOUT = config["chroma"]["request_timeout"]
+CHROMA_INDEX_SYNC_SECONDS = config["chroma"]["index_sync_seconds"]
+CHROMA_CHANGE_LOG_PAPERS = config["chroma"]["change_log_papers"]
+
+# RAG Configuration (chunk sizes are in approximate tokens)
+CHUNK_SIZE = config["rag"]["chunk_size"]
+CHUNK_OVERLAP = config["rag"]["chunk_overlap"]
+HYBRID_SEARCH = config["rag"]["hybrid_search"]
+CONTEXT_TOKEN_BUDGET = config["rag"]["context_token_budget"]
+CONTEXT_TOKEN_BUDGETS = config["rag"].get("context_budgets", {})
+RRF_K = config["rag"]["rrf_k"]
+BM25_K1 = config["rag"]["bm25_k1"]
+BM25_B = config["rag"]["bm25_b"]
+
+# Cache Configuration
+QUERY_CACHE_SIZE = config["cache"]["query_cache_size"]
+QUERY_CACHE_TTL = config["cache"]["query_cache_ttl"]
+LLM_CACHE_MAX_ENTRIES = config["cache"]["llm_cache_max_entries"]
+LLM_CACHE_MAX_BYTES = config["cache"]["llm_cache_max_bytes"]
+SEMANTIC_CACHE_ENABLED = config["cache"]["semantic_cache"]
+SEMANTIC_CACHE_THRESHOLD = config["cache"]["semantic_cache_threshold"]
+
+# Paper Processing Configuration
+PDF_WORKERS = config["processing"]["pdf_workers"]
+PDF_PAGES_PER_TASK = config["processing"]["pdf_pages_per_task"]
+PDF_PARALLEL_MIN_PAGES = config["processing"]["pdf_parallel_min_pages"]
+
+# Chat Configuration
+CHAT_HISTORY_TOKEN_BUDGET = config["chat"]["history_token_budget"]
+CHAT_MAX_CONVERSATIONS = config["chat"]["max_conversations"]
+CHAT_COMPACT_RETRY_SECONDS = config["chat"]["compact_retry_seconds"]
+
+# Background Job Configuration
+JOB_WORKERS = config["jobs"]["workers"]
+JOB_MAX_ATTEMPTS = config["jobs"]["max_attempts"]
+JOB_POLL_INTERVAL = config["jobs"]["poll_interval"]
+JOB_UI_REFRESH_SECONDS = config["jobs"]["ui_refresh_seconds"]
+JOB_HEARTBEAT_INTERVAL = config["jobs"]["heartbeat_interval"]
+JOB_RETENTION_DAYS = config["jobs"]["retention_days"]
 
 # Application Settings
 APP_TITLE = config["app"]["title"]
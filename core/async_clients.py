@@ -0,0 +1,167 @@
+import asyncio
+import ollama
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from config.settings import OLLAMA_BASE_URL, LLM_REQUEST_TIMEOUT, CHROMA_REQUEST_TIMEOUT, KEEP_ALIVE
+from core.llm_handler import ERROR_PREFIX, _StreamRecorder
+from utils.logger import get_logger
+
+# How often a request waiting for one of LLMHandler's slots checks again
+SLOT_POLL_SECONDS = 0.05
+
+
+class AsyncLLMHandler:
+    """asyncio counterpart of LLMHandler built on ollama.AsyncClient.
+
+    Prompts, the response cache, metrics and request slots are those of the wrapped LLMHandler, so sync
+    and async callers share one cache and together never exceed Ollama's parallel requests. Each request
+    is bounded by a timeout covering its wait for a slot, and cancelling the awaiting task closes the
+    HTTP request and frees the slot.
+    """
+
+    def __init__(self, llm_handler, timeout: float = LLM_REQUEST_TIMEOUT,
+                 client_factory: Callable[[], ollama.AsyncClient] = None):
+        self.logger = get_logger(__name__)
+        self.llm_handler = llm_handler
+        self.timeout = timeout
+        # A client per request: httpx connections are tied to the event loop, and each script run has its own
+        self.client_factory = client_factory or (lambda: ollama.AsyncClient(host=OLLAMA_BASE_URL))
+
+    async def _acquire_slot(self, deadline: float) -> None:
+        """Take one of LLMHandler's slots without blocking the event loop.
+
+        The slots are a threading semaphore shared with sync callers, so they are polled rather than
+        waited on from a worker thread that could take a slot after its waiter was cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        while not self.llm_handler._slots.acquire(blocking=False):
+            if loop.time() >= deadline:
+                raise asyncio.TimeoutError
+            await asyncio.sleep(SLOT_POLL_SECONDS)
+
+    async def generate_response(self, prompt: str, context: str = "", use_cache: bool = True,
+                                task: str = "chat", timeout: Optional[float] = None) -> str:
+        """Generate a complete response using the model routed for the task"""
+        self.logger.info(f"Generating async response for prompt: {prompt[:50]}...")
+        timeout = timeout or self.timeout
+        full_prompt = self.llm_handler._build_prompt(prompt, context)
+        route = self.llm_handler.route(task)
+        cache_key = self.llm_handler._cache_key(full_prompt, route)
+        cached = self.llm_handler._cached_response(cache_key, use_cache)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            await self._acquire_slot(deadline)
+            try:
+                started = time.perf_counter()
+                async with self.client_factory() as client:
+                    response = await asyncio.wait_for(
+                        client.chat(
+                            model=route['model'],
+                            messages=[{'role': 'user', 'content': full_prompt}],
+                            stream=False,
+                            options=route['options'],
+                            keep_alive=KEEP_ALIVE
+                        ),
+                        timeout=deadline - loop.time()
+                    )
+                self.llm_handler._record_latency(task, time.perf_counter() - started)
+            finally:
+                self.llm_handler._slots.release()
+            return self.llm_handler._record_completion(task, route, cache_key, response)
+        except asyncio.TimeoutError:
+            self.logger.error(f"Response timed out after {timeout}s")
+            return f"{ERROR_PREFIX}: timed out after {timeout}s"
+        except Exception as e:
+            self.logger.error(f"Error generating response: {str(e)}", exc_info=True)
+            return f"{ERROR_PREFIX}: {str(e)}"
+
+    async def stream_response(self, prompt: str, context: str = "", use_cache: bool = True, history: str = "",
+                              timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Yield content pieces as they arrive; the timeout applies to the whole stream"""
+        self.logger.info(f"Streaming async response for prompt: {prompt[:50]}...")
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            full_prompt = self.llm_handler._build_prompt(prompt, context, history)
+            route = self.llm_handler.route("chat")
+            cache_key = self.llm_handler._cache_key(full_prompt, route)
+            cached = self.llm_handler._cached_response(cache_key, use_cache)
+            if cached is not None:
+                yield cached
+                return
+
+            # As in LLMHandler.stream_response the slot is held for the whole stream
+            await self._acquire_slot(deadline)
+            try:
+                recorder = _StreamRecorder(self.llm_handler, route, cache_key)
+                async with self.client_factory() as client:
+                    stream = await asyncio.wait_for(
+                        client.chat(
+                            model=route['model'],
+                            messages=[{'role': 'user', 'content': full_prompt}],
+                            stream=True,
+                            options=route['options'],
+                            keep_alive=KEEP_ALIVE
+                        ),
+                        timeout=deadline - loop.time()
+                    )
+                    parts = stream.__aiter__()
+                    while True:
+                        try:
+                            part = await asyncio.wait_for(parts.__anext__(), timeout=deadline - loop.time())
+                        except StopAsyncIteration:
+                            break
+                        content = recorder.consume(part)
+                        if content:
+                            yield content
+                recorder.finish()
+            finally:
+                self.llm_handler._slots.release()
+        except asyncio.TimeoutError:
+            self.logger.error(f"Streaming response timed out after {timeout}s")
+            yield f"{ERROR_PREFIX}: timed out after {timeout}s"
+        except Exception as e:
+            self.logger.error(f"Error streaming response: {str(e)}", exc_info=True)
+            yield f"{ERROR_PREFIX}: {str(e)}"
+
+
+class AsyncVectorStore:
+    """asyncio wrapper running VectorStore searches on worker threads with a timeout.
+
+    The Chroma client cannot be interrupted, so a timed-out or cancelled search stops being awaited
+    while its thread finishes in the background.
+    """
+
+    def __init__(self, vector_store, timeout: float = CHROMA_REQUEST_TIMEOUT):
+        self.vector_store = vector_store
+        self.timeout = timeout
+
+    async def search_papers(self, query: str, n_results: int = 5, where: Optional[Dict] = None) -> List[Dict]:
+        return await asyncio.wait_for(
+            asyncio.to_thread(self.vector_store.search_papers, query, n_results, where),
+            timeout=self.timeout
+        )
+
+
+async def recall_and_retrieve(conversation_memory, vector_store: AsyncVectorStore, conversation_id: Optional[str],
+                              question: str, n_results: int = 5, use_rag: bool = True) -> Tuple[str, List[Dict]]:
+    """Load a conversation's history while searching for the question's papers.
+
+    Recalling history may ask the model to compact older turns, so the search runs alongside that
+    generation instead of after it.
+    """
+    async def recall() -> str:
+        if conversation_id is None:
+            return ""
+        return await asyncio.to_thread(conversation_memory.history, conversation_id)
+
+    async def retrieve() -> List[Dict]:
+        return await vector_store.search_papers(question, n_results) if use_rag else []
+
+    history, papers = await asyncio.gather(recall(), retrieve())
+    return history, papers
@@ -0,0 +1,154 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+from config.settings import BM25_K1, BM25_B
+from utils.logger import get_logger
+
+# Compound terms such as "imagenet-1k", "eq.3" or "gpt-4" are kept whole and also split into parts
+TERM_PATTERN = re.compile(r"\w+(?:[-.]\w+)*")
+PART_PATTERN = re.compile(r"\w+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the their this to was were which with
+we our can not but also these those such than then there been into more
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased index terms for text"""
+    terms = []
+    for match in TERM_PATTERN.finditer(text.lower()):
+        term = match.group()
+        if term not in STOPWORDS:
+            terms.append(term)
+        if '-' in term or '.' in term:
+            terms.extend(part for part in PART_PATTERN.findall(term) if part not in STOPWORDS)
+    return terms
+
+
+class BM25Index:
+    """Incrementally maintained BM25 inverted index over vector store chunks, persisted in SQLite"""
+
+    def __init__(self, index_path: Path, k1: float = BM25_K1, b: float = BM25_B):
+        self.logger = get_logger(__name__)
+        self.k1 = k1
+        self.b = b
+        os.makedirs(Path(index_path).parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(index_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                chunk_id TEXT PRIMARY KEY,
+                paper_id TEXT NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_docs_paper ON docs (paper_id);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, chunk_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_chunk ON postings (chunk_id);
+            CREATE TABLE IF NOT EXISTS stats (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO stats (key, value) VALUES ('doc_count', 0), ('total_length', 0);
+        """)
+        self.conn.commit()
+
+    def _stats(self) -> Tuple[int, int]:
+        rows = dict(self.conn.execute("SELECT key, value FROM stats"))
+        return rows['doc_count'], rows['total_length']
+
+    def doc_count(self) -> int:
+        """Number of indexed chunks"""
+        with self._lock:
+            return self._stats()[0]
+
+    def add_chunks(self, chunks: Iterable[Dict]) -> None:
+        """Index chunks; chunks that are already indexed are skipped"""
+        with self._lock, self.conn:
+            added, added_length = 0, 0
+            for chunk in chunks:
+                terms = Counter(tokenize(chunk['content']))
+                length = sum(terms.values())
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO docs (chunk_id, paper_id, length) VALUES (?, ?, ?)",
+                    (chunk['id'], chunk['metadata'].get('paper_id', chunk['id']), length)
+                )
+                if not cursor.rowcount:
+                    continue
+                self.conn.executemany(
+                    "INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                    ((term, chunk['id'], tf) for term, tf in terms.items())
+                )
+                added += 1
+                added_length += length
+            self._update_stats(added, added_length)
+
+    def remove_paper(self, paper_id: str) -> None:
+        """Remove all chunks of a paper from the index"""
+        with self._lock:
+            chunk_ids = [row[0] for row in self.conn.execute(
+                "SELECT chunk_id FROM docs WHERE paper_id = ?", (paper_id,)
+            )]
+        self.remove_chunks(chunk_ids)
+
+    def remove_chunks(self, chunk_ids: List[str]) -> None:
+        """Remove chunks from the index"""
+        with self._lock, self.conn:
+            removed, removed_length = 0, 0
+            for chunk_id in chunk_ids:
+                row = self.conn.execute("SELECT length FROM docs WHERE chunk_id = ?", (chunk_id,)).fetchone()
+                if row is None:
+                    continue
+                self.conn.execute("DELETE FROM postings WHERE chunk_id = ?", (chunk_id,))
+                self.conn.execute("DELETE FROM docs WHERE chunk_id = ?", (chunk_id,))
+                removed += 1
+                removed_length += row[0]
+            self._update_stats(-removed, -removed_length)
+
+    def clear(self) -> None:
+        """Remove every chunk, e.g. before rebuilding from the collection"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM postings")
+            self.conn.execute("DELETE FROM docs")
+            self.conn.execute("UPDATE stats SET value = 0")
+
+    def _update_stats(self, doc_delta: int, length_delta: int) -> None:
+        self.conn.execute("UPDATE stats SET value = value + ? WHERE key = 'doc_count'", (doc_delta,))
+        self.conn.execute("UPDATE stats SET value = value + ? WHERE key = 'total_length'", (length_delta,))
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return (chunk_id, score) pairs for the best BM25 matches"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            doc_count, total_length = self._stats()
+            if not doc_count:
+                return []
+            avg_length = total_length / doc_count
+
+            scores = Counter()
+            for term in terms:
+                rows = self.conn.execute(
+                    "SELECT p.chunk_id, p.tf, d.length FROM postings p JOIN docs d ON d.chunk_id = p.chunk_id "
+                    "WHERE p.term = ?", (term,)
+                ).fetchall()
+                if not rows:
+                    continue
+                idf = math.log(1 + (doc_count - len(rows) + 0.5) / (len(rows) + 0.5))
+                for chunk_id, tf, length in rows:
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[chunk_id] += idf * tf * (self.k1 + 1) / norm
+
+        return scores.most_common(limit)
@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List
+from config.settings import SUPPORTED_FORMATS, MAX_FILE_SIZE, INGEST_MANIFEST_PATH
+from utils.logger import get_logger
+
+PENDING = 'pending'
+IN_PROGRESS = 'in_progress'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class IngestManifest:
+    """Persistent record of every file seen by a bulk ingest and its status"""
+
+    def __init__(self, manifest_path: Path = INGEST_MANIFEST_PATH):
+        self.manifest_path = Path(manifest_path)
+        os.makedirs(self.manifest_path.parent, exist_ok=True)
+        self.conn = sqlite3.connect(self.manifest_path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                paper_id TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_files_status ON files (status)")
+        self.conn.commit()
+
+    def add_pending(self, paths: Iterable[str]) -> int:
+        """Register newly discovered files; files already in the manifest keep their status"""
+        now = datetime.now().isoformat()
+        cursor = self.conn.executemany(
+            "INSERT OR IGNORE INTO files (path, status, updated_at) VALUES (?, ?, ?)",
+            ((path, PENDING, now) for path in paths)
+        )
+        self.conn.commit()
+        return cursor.rowcount
+
+    def recover(self, retry_failed: bool = False, max_attempts: int = 3) -> None:
+        """Requeue files left in progress by a crash, and optionally failed files"""
+        now = datetime.now().isoformat()
+        self.conn.execute(
+            "UPDATE files SET status = ?, updated_at = ? WHERE status = ?",
+            (PENDING, now, IN_PROGRESS)
+        )
+        if retry_failed:
+            self.conn.execute(
+                "UPDATE files SET status = ?, updated_at = ? WHERE status = ? AND attempts < ?",
+                (PENDING, now, FAILED, max_attempts)
+            )
+        self.conn.commit()
+
+    def pending_paths(self) -> List[str]:
+        """Files still waiting to be ingested"""
+        rows = self.conn.execute("SELECT path FROM files WHERE status = ? ORDER BY path", (PENDING,))
+        return [row[0] for row in rows]
+
+    def set_status(self, path: str, status: str, paper_id: str = None, error: str = None) -> None:
+        """Update the status of a file"""
+        attempts = ", attempts = attempts + 1" if status == IN_PROGRESS else ""
+        self.conn.execute(
+            f"UPDATE files SET status = ?, paper_id = COALESCE(?, paper_id), error = ?, updated_at = ?{attempts} "
+            "WHERE path = ?",
+            (status, paper_id, error, datetime.now().isoformat(), path)
+        )
+        self.conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        """Number of files in each status"""
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM files GROUP BY status")
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class BulkIngestor:
+    """Headless ingest of a directory tree through PaperProcessor and VectorStore"""
+
+    def __init__(self, paper_processor, vector_store, manifest: IngestManifest,
+                 concurrency: int = 4, batch_size: int = 500):
+        self.logger = get_logger(__name__)
+        self.paper_processor = paper_processor
+        self.vector_store = vector_store
+        self.manifest = manifest
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self._batch: List[Dict] = []
+
+    @staticmethod
+    def discover(root: Path) -> List[str]:
+        """Find all supported papers below root"""
+        paths = []
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in SUPPORTED_FORMATS:
+                    paths.append(str(Path(dirpath) / filename))
+        return paths
+
+    def _process_path(self, path: str) -> Dict:
+        """Read and process a single file (runs on a worker thread; PDF extraction may be handed to the processor's process pool)"""
+        if os.path.getsize(path) > MAX_FILE_SIZE:
+            return {'success': False, 'error': f"File too large (max {MAX_FILE_SIZE // (1024 * 1024)}MB)"}
+        with open(path, 'rb') as f:
+            data = f.read()
+        return self.paper_processor.process_bytes(os.path.basename(path), data)
+
+    def run(self, root: Path, retry_failed: bool = False) -> Dict[str, int]:
+        """Ingest every pending file below root and return the final status counts"""
+        added = self.manifest.add_pending(self.discover(root))
+        self.manifest.recover(retry_failed=retry_failed)
+        pending = self.manifest.pending_paths()
+        self.logger.info(f"Discovered {added} new files, {len(pending)} pending")
+
+        started = time.perf_counter()
+        completed = 0
+        queue = iter(pending)
+        in_flight = {}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                while True:
+                    # Keep a bounded number of files in memory at once
+                    while len(in_flight) < self.concurrency * 2:
+                        path = next(queue, None)
+                        if path is None:
+                            break
+                        self.manifest.set_status(path, IN_PROGRESS)
+                        in_flight[executor.submit(self._process_path, path)] = path
+
+                    if not in_flight:
+                        break
+
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        path = in_flight.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = {'success': False, 'error': str(e)}
+                        self._handle_result(path, result)
+                        completed += 1
+
+                    if completed and completed % 100 == 0:
+                        rate = completed / (time.perf_counter() - started)
+                        self.logger.info(f"Processed {completed}/{len(pending)} files ({rate:.1f} files/s)")
+        finally:
+            self._flush()
+
+        counts = self.manifest.counts()
+        self.logger.info(f"Bulk ingest finished in {time.perf_counter() - started:.1f}s: {counts}")
+        return counts
+
+    def _handle_result(self, path: str, result: Dict) -> None:
+        """Record a failure immediately or queue the paper for the next vector store batch"""
+        if not result['success']:
+            self.logger.warning(f"Failed to process {path}: {result['error']}")
+            self.manifest.set_status(path, FAILED, error=result['error'])
+            return
+
+        if result['cached'] and self.vector_store.has_paper(result['id']):
+            self.manifest.set_status(path, DONE, paper_id=result['id'])
+            return
+
+        result['source_path'] = path
+        self._batch.append(result)
+        if sum(len(paper['chunks']) for paper in self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered papers to the vector store in one batch"""
+        if not self._batch:
+            return
+
+        batch, self._batch = self._batch, []
+        unique = {}
+        for paper in batch:
+            unique.setdefault(paper['id'], paper)
+
+        outcome = self.vector_store.add_papers(list(unique.values()))
+        for paper in batch:
+            if outcome.get(paper['id']):
+                self.manifest.set_status(paper['source_path'], DONE, paper_id=paper['id'])
+            else:
+                self.manifest.set_status(paper['source_path'], FAILED, paper_id=paper['id'],
+                                         error="Failed to add to vector store")
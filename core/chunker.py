@@ -0,0 +1,143 @@
+import re
+from typing import Dict, List, Tuple
+from config.settings import CHUNK_SIZE, CHUNK_OVERLAP
+from utils.token_utils import TokenUtils
+
+# Canonical section name for each heading variant found in papers
+SECTION_ALIASES = {
+    'abstract': 'abstract',
+    'introduction': 'introduction',
+    'related work': 'related_work',
+    'related works': 'related_work',
+    'literature review': 'related_work',
+    'background': 'background',
+    'preliminaries': 'background',
+    'method': 'methods',
+    'methods': 'methods',
+    'methodology': 'methods',
+    'materials and methods': 'methods',
+    'proposed method': 'methods',
+    'approach': 'methods',
+    'experiments': 'experiments',
+    'experimental setup': 'experiments',
+    'evaluation': 'experiments',
+    'results': 'results',
+    'results and discussion': 'results',
+    'discussion': 'discussion',
+    'limitations': 'discussion',
+    'conclusion': 'conclusion',
+    'conclusions': 'conclusion',
+    'future work': 'conclusion',
+    'acknowledgements': 'acknowledgements',
+    'acknowledgments': 'acknowledgements',
+    'references': 'references',
+    'bibliography': 'references',
+    'appendix': 'appendix',
+}
+
+# A heading is a short line such as "Abstract", "1. Introduction", "III. METHODOLOGY"
+# or an inline IEEE-style "Abstract—..." opener
+SECTION_HEADING = re.compile(
+    r"^[ \t]*(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?[ \t]+)?"
+    r"(?P<name>" + "|".join(sorted((re.escape(a) for a in SECTION_ALIASES), key=len, reverse=True)) + r")"
+    r"[ \t]*(?:$|[:.—–-])",
+    re.IGNORECASE | re.MULTILINE
+)
+
+FRONT_MATTER = 'front_matter'
+
+
+def chunk_id(paper_id: str, index: int) -> str:
+    """Vector store ID of a paper's chunk"""
+    return f"{paper_id}_chunk_{index:04d}"
+
+
+class TextChunker:
+    def __init__(self, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP):
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split_sections(self, text: str) -> List[Tuple[str, int, int]]:
+        """Split text into (section, start_char, end_char) spans by detected headings"""
+        boundaries = []
+        for match in SECTION_HEADING.finditer(text):
+            section = SECTION_ALIASES[match.group('name').lower()]
+            if boundaries and boundaries[-1][0] == section:
+                continue
+            boundaries.append((section, match.start()))
+
+        if not boundaries or boundaries[0][1] > 0:
+            boundaries.insert(0, (FRONT_MATTER, 0))
+
+        sections = []
+        for i, (section, start) in enumerate(boundaries):
+            end = boundaries[i + 1][1] if i + 1 < len(boundaries) else len(text)
+            if text[start:end].strip():
+                sections.append((section, start, end))
+        return sections
+
+    def chunk_text(self, text: str) -> List[Dict]:
+        """Split text into section-aware, token-bounded overlapping windows"""
+        chunks = []
+        step = self.chunk_size - self.chunk_overlap
+
+        for section, section_start, section_end in self.split_sections(text):
+            spans = TokenUtils.token_spans(text[section_start:section_end])
+            for first in range(0, len(spans), step):
+                window = spans[first:first + self.chunk_size]
+                start_char = section_start + window[0][0]
+                end_char = section_start + window[-1][1]
+                chunks.append({
+                    'section': section,
+                    'content': text[start_char:end_char],
+                    'start_char': start_char,
+                    'end_char': end_char
+                })
+                if first + self.chunk_size >= len(spans):
+                    break
+
+        if not chunks:
+            chunks.append({
+                'section': FRONT_MATTER,
+                'content': text,
+                'start_char': 0,
+                'end_char': len(text)
+            })
+        return chunks
+
+    def chunk_paper(self, paper_id: str, content: str, metadata: Dict) -> List[Dict]:
+        """Build vector store records for each chunk of a paper"""
+        records = []
+        for i, chunk in enumerate(self.chunk_text(content)):
+            records.append({
+                'id': chunk_id(paper_id, i),
+                'content': chunk['content'],
+                'metadata': {
+                    **metadata,
+                    'paper_id': paper_id,
+                    'section': chunk['section'],
+                    'chunk_index': i,
+                    'start_char': chunk['start_char'],
+                    'end_char': chunk['end_char']
+                }
+            })
+        return records
+
+
+def stitch_chunks(chunks: List[Dict]) -> str:
+    """Rebuild the original text from overlapping chunks using their offsets"""
+    parts = []
+    covered = 0
+    for chunk in sorted(chunks, key=lambda c: c['metadata'].get('start_char', 0)):
+        start = chunk['metadata'].get('start_char', covered)
+        end = chunk['metadata'].get('end_char', start + len(chunk['content']))
+        if end <= covered:
+            continue
+        if start > covered:
+            parts.append("\n")
+            covered = start
+        parts.append(chunk['content'][covered - start:])
+        covered = end
+    return "".join(parts)
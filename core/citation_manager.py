@@ -1,10 +1,12 @@
 import json
 import os
+import threading
 import uuid
 import pandas as pd
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 from config.settings import CITATIONS_DIR
+from core.event_log import CITATION_CREATED, get_event_log
 
 
 class CitationManager:
@@ -13,6 +15,8 @@ class CitationManager:
         # Ensure directory exists
         os.makedirs(self.citations_dir, exist_ok=True)
         self.citations_file = self.citations_dir / "citations.json"
+        # One instance is shared by all app sessions; serialize changes to the list and file
+        self._lock = threading.RLock()
         self.citations = self._load_citations()
 
     def _load_citations(self) -> List[Dict[str, Any]]:
@@ -58,8 +62,10 @@ class CitationManager:
             'notes': paper_data.get('notes', '')
         }
 
-        self.citations.append(citation)
-        self._save_citations()
+        with self._lock:
+            self.citations.append(citation)
+            self._save_citations()
+        get_event_log().record(CITATION_CREATED, citation['id'])
         return citation['id']
 
     def get_citation(self, citation_id: str) -> Optional[Dict[str, Any]]:
@@ -100,11 +106,12 @@ class CitationManager:
 
     def delete_citation(self, citation_id: str) -> bool:
         """Delete a citation"""
-        for i, citation in enumerate(self.citations):
-            if citation['id'] == citation_id:
-                del self.citations[i]
-                self._save_citations()
-                return True
+        with self._lock:
+            for i, citation in enumerate(self.citations):
+                if citation['id'] == citation_id:
+                    del self.citations[i]
+                    self._save_citations()
+                    return True
         return False
 
     def format_citation(self, citation_id: str, style: str = "apa") -> str:
@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional, Tuple
+from config.settings import CONTEXT_TOKEN_BUDGET, CONTEXT_TOKEN_BUDGETS
+from utils.token_utils import TokenUtils
+
+# Chunks whose text is mostly already covered by a selected neighbour are skipped
+MIN_NEW_FRACTION = 0.2
+# Don't bother adding a truncated piece smaller than this many tokens
+MIN_PIECE_TOKENS = 40
+
+
+class ContextBuilder:
+    """Packs the highest-ranked search hits into a fixed token budget for RAG prompts"""
+
+    def __init__(self, token_budget: int = CONTEXT_TOKEN_BUDGET):
+        self.token_budget = token_budget
+
+    @classmethod
+    def for_model(cls, model_name: str) -> 'ContextBuilder':
+        """Builder using the budget configured for a model, falling back to the default"""
+        return cls(CONTEXT_TOKEN_BUDGETS.get(model_name, CONTEXT_TOKEN_BUDGET))
+
+    def build(self, relevant_papers: List[Dict], summaries: Optional[Dict[str, Dict]] = None) -> Tuple[str, Dict]:
+        """Build prompt context from grouped search hits and return it with budget usage stats"""
+        summaries = summaries or {}
+        candidates = []
+        for paper in relevant_papers:
+            best_rank = min((chunk.get('rank', 0) for chunk in paper['chunks']), default=0)
+            if paper['id'] in summaries:
+                # A stored summary describes the whole paper, so it goes just ahead of the paper's best hit
+                candidates.append((best_rank - 0.5, paper['id'], {
+                    'kind': 'summary',
+                    'content': summaries[paper['id']]['summary']
+                }))
+            for chunk in paper['chunks']:
+                candidates.append((chunk.get('rank', 0), paper['id'], {'kind': 'chunk', **chunk}))
+        candidates.sort(key=lambda candidate: candidate[0])
+
+        # Summaries may not crowd out passages: cap each at a share of the budget
+        summary_cap = self.token_budget // (2 * max(len(summaries), 1))
+        used = 0
+        selected: Dict[str, List[Dict]] = {}
+        covered: Dict[str, List[Tuple[int, int]]] = {}
+        stats = {'budget': self.token_budget, 'chunks_used': 0, 'chunks_dropped': 0, 'duplicates_skipped': 0}
+
+        for _, paper_id, piece in candidates:
+            remaining = self.token_budget - used
+            if remaining < MIN_PIECE_TOKENS:
+                if piece['kind'] == 'chunk':
+                    stats['chunks_dropped'] += 1
+                continue
+
+            if piece['kind'] == 'chunk':
+                piece = self._trim_overlap(piece, covered.get(paper_id, []))
+                if piece is None:
+                    stats['duplicates_skipped'] += 1
+                    continue
+                limit = remaining
+            else:
+                limit = min(remaining, summary_cap)
+
+            text = TokenUtils.truncate(piece['content'], limit)
+            tokens = TokenUtils.count_tokens(text)
+            if tokens < MIN_PIECE_TOKENS and tokens < TokenUtils.count_tokens(piece['content']):
+                if piece['kind'] == 'chunk':
+                    stats['chunks_dropped'] += 1
+                continue
+
+            selected.setdefault(paper_id, []).append({**piece, 'content': text})
+            used += tokens
+            if piece['kind'] == 'chunk':
+                stats['chunks_used'] += 1
+                covered.setdefault(paper_id, []).append((piece['start_char'], piece['end_char']))
+
+        sections = []
+        for paper in relevant_papers:
+            if paper['id'] not in selected:
+                continue
+            lines = [f"Paper: {paper['metadata'].get('title', 'Unknown')}"]
+            pieces = selected[paper['id']]
+            lines += [f"Summary: {piece['content']}" for piece in pieces if piece['kind'] == 'summary']
+            lines += [
+                f"[{piece['section']}] {piece['content']}"
+                for piece in sorted(pieces, key=lambda p: p.get('start_char', 0)) if piece['kind'] == 'chunk'
+            ]
+            sections.append("\n".join(lines))
+
+        stats['used_tokens'] = used
+        stats['utilization'] = used / self.token_budget if self.token_budget else 0.0
+        return "\n\n".join(sections), stats
+
+    @staticmethod
+    def _trim_overlap(chunk: Dict, spans: List[Tuple[int, int]]) -> Optional[Dict]:
+        """Cut text already covered by selected chunks off either end, or drop a mostly duplicate chunk"""
+        start, end = chunk['start_char'], chunk['end_char']
+        for span_start, span_end in spans:
+            if span_start <= start < span_end:
+                start = span_end
+            if span_start < end <= span_end:
+                end = span_start
+        length = chunk['end_char'] - chunk['start_char']
+        if end <= start or (end - start) < MIN_NEW_FRACTION * length:
+            return None
+        offset = start - chunk['start_char']
+        return {
+            **chunk,
+            'content': chunk['content'][offset:offset + end - start].strip(),
+            'start_char': start,
+            'end_char': end
+        }
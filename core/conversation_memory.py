@@ -0,0 +1,89 @@
+import time
+from typing import Dict, List
+from config.settings import CHAT_HISTORY_TOKEN_BUDGET, CHAT_COMPACT_RETRY_SECONDS
+from core.llm_handler import ERROR_PREFIX
+from utils.logger import get_logger
+from utils.token_utils import TokenUtils
+
+
+def _format_summary(summary: str) -> str:
+    return f"Summary of earlier conversation: {summary}" if summary else ""
+
+
+def _format_turns(messages: List[Dict]) -> str:
+    return "\n".join(
+        f"{'User' if message['role'] == 'user' else 'Assistant'}: {message['content']}" for message in messages
+    )
+
+
+class ConversationMemory:
+    """Builds the conversation history for a prompt within a fixed token budget.
+
+    Recent turns are kept verbatim; turns that no longer fit are folded into the
+    conversation's rolling summary, which is itself capped at a third of the budget.
+    If summarizing fails, the oldest turns are dropped instead until a retry is due.
+    """
+
+    def __init__(self, conversation_store, llm_handler, token_budget: int = CHAT_HISTORY_TOKEN_BUDGET,
+                 compact_retry_seconds: float = CHAT_COMPACT_RETRY_SECONDS):
+        self.logger = get_logger(__name__)
+        self.conversation_store = conversation_store
+        self.llm_handler = llm_handler
+        self.token_budget = token_budget
+        self.summary_budget = token_budget // 3
+        self.compact_retry_seconds = compact_retry_seconds
+        self._compact_failures = {}
+
+    def history(self, conversation_id: str) -> str:
+        """History text for the next prompt, compacting older turns first if needed"""
+        conversation = self.conversation_store.get(conversation_id)
+        if conversation is None:
+            return ""
+        summary = conversation['summary']
+        messages = self.conversation_store.messages(conversation_id, after_seq=conversation['summarized_through'])
+        # Failed answers are shown in the chat but are not part of the conversation
+        messages = [message for message in messages if not message.get('error')]
+
+        # Keep as many of the newest turns as fit next to the summary
+        available = self.token_budget - TokenUtils.count_tokens(_format_summary(summary))
+        split = len(messages)
+        used = 0
+        while split > 0:
+            tokens = TokenUtils.count_tokens(_format_turns(messages[split - 1:split]))
+            if used + tokens > available:
+                break
+            used += tokens
+            split -= 1
+
+        if split > 0:
+            summary = self._compact(conversation_id, summary, messages[:split])
+            recent = messages[split:]
+            # The summary may have grown; drop the oldest verbatim turns until everything fits again
+            available = self.token_budget - TokenUtils.count_tokens(_format_summary(summary))
+            while recent and TokenUtils.count_tokens(_format_turns(recent)) > available:
+                recent = recent[1:]
+        else:
+            recent = messages
+
+        return "\n\n".join(part for part in (_format_summary(summary), _format_turns(recent)) if part)
+
+    def _compact(self, conversation_id: str, summary: str, messages: List[Dict]) -> str:
+        """Fold older turns into the rolling summary and persist it"""
+        failed_at = self._compact_failures.get(conversation_id)
+        if failed_at is not None and time.monotonic() - failed_at < self.compact_retry_seconds:
+            # Summarizing failed recently; leave the oldest turns out rather than retry on every question
+            return summary
+
+        self.logger.info(f"Compacting {len(messages)} messages of conversation {conversation_id}")
+        new_summary = self.llm_handler.summarize_conversation(summary, _format_turns(messages), self.summary_budget)
+        if new_summary.startswith(ERROR_PREFIX):
+            self._compact_failures[conversation_id] = time.monotonic()
+            self.logger.warning(
+                f"Could not compact conversation {conversation_id}, dropping its {len(messages)} oldest messages "
+                f"for {self.compact_retry_seconds:.0f}s: {new_summary}"
+            )
+            return summary
+        self._compact_failures.pop(conversation_id, None)
+        new_summary = TokenUtils.truncate(new_summary, self.summary_budget)
+        self.conversation_store.set_summary(conversation_id, new_summary, messages[-1]['seq'])
+        return new_summary
@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import CONVERSATIONS_PATH, CHAT_MAX_CONVERSATIONS
+from utils.logger import get_logger
+
+
+class ConversationStore:
+    """Durable chat conversations: append-only messages plus a rolling summary of compacted turns"""
+
+    def __init__(self, store_path: Path = CONVERSATIONS_PATH, max_conversations: int = CHAT_MAX_CONVERSATIONS):
+        self.logger = get_logger(__name__)
+        self.max_conversations = max_conversations
+        os.makedirs(Path(store_path).parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(store_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                summary TEXT NOT NULL DEFAULT '',
+                summarized_through INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_conversations_updated ON conversations (updated_at);
+            CREATE TABLE IF NOT EXISTS messages (
+                conversation_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                extra TEXT,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (conversation_id, seq)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def create(self, title: str) -> str:
+        """Start a conversation, dropping the least recently updated ones beyond the limit"""
+        conversation_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO conversations (id, title, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (conversation_id, title[:100], now, now)
+            )
+            stale = [row[0] for row in self.conn.execute(
+                "SELECT id FROM conversations ORDER BY updated_at DESC LIMIT -1 OFFSET ?", (self.max_conversations,)
+            )]
+            for stale_id in stale:
+                self.conn.execute("DELETE FROM messages WHERE conversation_id = ?", (stale_id,))
+                self.conn.execute("DELETE FROM conversations WHERE id = ?", (stale_id,))
+        return conversation_id
+
+    def append(self, conversation_id: str, message: Dict) -> int:
+        """Append a message ({'role', 'content', 'timestamp', ...}) and return its sequence number"""
+        extra = {key: value for key, value in message.items() if key not in ('role', 'content', 'timestamp')}
+        timestamp = message.get('timestamp') or datetime.now().isoformat()
+        with self._lock, self.conn:
+            seq = self.conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM messages WHERE conversation_id = ?", (conversation_id,)
+            ).fetchone()[0]
+            self.conn.execute(
+                "INSERT INTO messages (conversation_id, seq, role, content, extra, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (conversation_id, seq, message['role'], message['content'],
+                 json.dumps(extra) if extra else None, timestamp)
+            )
+            self.conn.execute("UPDATE conversations SET updated_at = ? WHERE id = ?", (timestamp, conversation_id))
+        return seq
+
+    def messages(self, conversation_id: str, after_seq: int = 0) -> List[Dict]:
+        """Messages in order, optionally only those after a sequence number"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT seq, role, content, extra, created_at FROM messages "
+                "WHERE conversation_id = ? AND seq > ? ORDER BY seq",
+                (conversation_id, after_seq)
+            ).fetchall()
+        return [
+            {'seq': seq, 'role': role, 'content': content, 'timestamp': created_at, **(json.loads(extra) if extra else {})}
+            for seq, role, content, extra, created_at in rows
+        ]
+
+    def get(self, conversation_id: str) -> Optional[Dict]:
+        """Conversation header including its rolling summary"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, title, summary, summarized_through, created_at, updated_at FROM conversations WHERE id = ?",
+                (conversation_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('id', 'title', 'summary', 'summarized_through', 'created_at', 'updated_at'), row))
+
+    def set_summary(self, conversation_id: str, summary: str, summarized_through: int) -> None:
+        """Replace the rolling summary covering messages up to summarized_through"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE conversations SET summary = ?, summarized_through = ? WHERE id = ?",
+                (summary, summarized_through, conversation_id)
+            )
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        """Most recently updated conversations"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, title, updated_at FROM conversations ORDER BY updated_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{'id': conversation_id, 'title': title, 'updated_at': updated_at}
+                for conversation_id, title, updated_at in rows]
+
+    def count(self) -> int:
+        """Number of stored conversations"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+    def export(self) -> List[Dict]:
+        """All conversations with their messages, most recent first"""
+        conversations = []
+        for conversation in self.recent(limit=self.max_conversations):
+            conversations.append({**conversation, 'messages': self.messages(conversation['id'])})
+        return conversations
@@ -0,0 +1,95 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import EVENT_LOG_PATH
+from utils.logger import get_logger
+
+PAPER_ADDED = 'paper_added'
+PAPER_DELETED = 'paper_deleted'
+CITATION_CREATED = 'citation_created'
+QUERY_MADE = 'query_made'
+SUMMARY_GENERATED = 'summary_generated'
+
+_event_log = None
+_event_log_lock = threading.Lock()
+
+
+class EventLog:
+    """Append-only activity log with per-day rollups maintained on every write"""
+
+    def __init__(self, log_path: Path = EVENT_LOG_PATH):
+        self.logger = get_logger(__name__)
+        os.makedirs(Path(log_path).parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(log_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recorded_at TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                subject TEXT,
+                duration_seconds REAL,
+                data TEXT
+            );
+            CREATE TABLE IF NOT EXISTS daily_rollups (
+                day TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                total_seconds REAL NOT NULL,
+                PRIMARY KEY (day, event_type)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def record(self, event_type: str, subject: Optional[str] = None, duration_seconds: Optional[float] = None,
+               **data) -> None:
+        """Append an event and add it to its day's rollup; failures are logged, never raised"""
+        now = datetime.now()
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    "INSERT INTO events (recorded_at, event_type, subject, duration_seconds, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (now.isoformat(), event_type, subject, duration_seconds, json.dumps(data) if data else None)
+                )
+                self.conn.execute(
+                    "INSERT INTO daily_rollups (day, event_type, count, total_seconds) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT (day, event_type) DO UPDATE SET "
+                    "count = count + 1, total_seconds = total_seconds + excluded.total_seconds",
+                    (now.date().isoformat(), event_type, duration_seconds or 0.0)
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not record {event_type} event: {e}")
+
+    def daily_counts(self, days: int = 7) -> List[Dict]:
+        """Per-day rollups for the last `days` days, including days without events"""
+        start = date.today() - timedelta(days=days - 1)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT day, event_type, count, total_seconds FROM daily_rollups WHERE day >= ? AND day <= ?",
+                (start.isoformat(), date.today().isoformat())
+            ).fetchall()
+
+        by_day = {(start + timedelta(days=i)).isoformat(): {} for i in range(days)}
+        for day, event_type, count, total_seconds in rows:
+            by_day[day][event_type] = {'count': count, 'total_seconds': total_seconds}
+        return [{'day': day, 'events': events} for day, events in by_day.items()]
+
+    def totals(self) -> Dict[str, int]:
+        """All-time event counts by type"""
+        with self._lock:
+            rows = self.conn.execute("SELECT event_type, SUM(count) FROM daily_rollups GROUP BY event_type")
+            return {event_type: count for event_type, count in rows}
+
+
+def get_event_log() -> EventLog:
+    """Process-wide event log shared by all writers"""
+    global _event_log
+    with _event_log_lock:
+        if _event_log is None:
+            _event_log = EventLog()
+        return _event_log
@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+from config.settings import INGEST_CACHE_DIR
+from utils.logger import get_logger
+
+
+class IngestCache:
+    """Content-addressed store of uploaded files and their extracted text.
+
+    Blobs and sidecars are keyed on the SHA-256 of the raw uploaded bytes, so a
+    re-upload (under any filename) is recognised before any PDF parsing happens.
+    """
+
+    def __init__(self, cache_dir: Path = INGEST_CACHE_DIR):
+        self.logger = get_logger(__name__)
+        self.cache_dir = Path(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Hash raw file bytes"""
+        return hashlib.sha256(data).hexdigest()
+
+    def _entry_dir(self, digest: str) -> Path:
+        return self.cache_dir / digest[:2]
+
+    def blob_path(self, digest: str, extension: str) -> Path:
+        """Path of the stored blob for a content hash"""
+        return self._entry_dir(digest) / f"{digest}{extension.lower()}"
+
+    def _sidecar_path(self, digest: str) -> Path:
+        return self._entry_dir(digest) / f"{digest}.json"
+
+    def store_blob(self, digest: str, data: bytes, extension: str) -> Path:
+        """Write the raw bytes once; identical content is never written twice"""
+        path = self.blob_path(digest, extension)
+        if not path.exists():
+            os.makedirs(path.parent, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return path
+
+    def get(self, digest: str) -> Optional[Dict]:
+        """Load the cached extraction record for a content hash"""
+        sidecar = self._sidecar_path(digest)
+        if not sidecar.exists():
+            return None
+        try:
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            self.logger.warning(f"Ignoring unreadable cache entry {digest}: {e}")
+            return None
+
+    def put(self, digest: str, record: Dict) -> None:
+        """Save the extraction record for a content hash"""
+        sidecar = self._sidecar_path(digest)
+        os.makedirs(sidecar.parent, exist_ok=True)
+        tmp_path = sidecar.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, sidecar)
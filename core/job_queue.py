@@ -0,0 +1,267 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from config.settings import (
+    JOB_QUEUE_PATH, JOB_MAX_ATTEMPTS, JOB_POLL_INTERVAL, JOB_HEARTBEAT_INTERVAL, JOB_RETENTION_DAYS
+)
+from utils.logger import get_logger
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# A running job whose worker hasn't sent a heartbeat for this many intervals is considered orphaned
+STALE_HEARTBEATS = 3
+
+_active_workers = None
+_workers_lock = threading.Lock()
+
+
+class JobQueue:
+    """Persistent queue of background jobs with status, progress and retry bookkeeping"""
+
+    def __init__(self, queue_path: Path = JOB_QUEUE_PATH, max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.logger = get_logger(__name__)
+        self.max_attempts = max_attempts
+        os.makedirs(Path(queue_path).parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(queue_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                label TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                message TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                heartbeat_at REAL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        # Queues created before workers were tracked lack the ownership columns
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (('worker_id', 'TEXT'), ('heartbeat_at', 'REAL')):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+        self.conn.commit()
+
+    def enqueue(self, kind: str, payload: Dict, label: str = "") -> str:
+        """Add a job and return its ID"""
+        job_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs (id, kind, label, payload, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, label or kind, json.dumps(payload), QUEUED, now, now)
+            )
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Mark the oldest queued job as running on a worker and return it"""
+        with self._lock, self.conn:
+            # Other processes may share the queue file; take the write lock before picking a job
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute(
+                "SELECT id, kind, payload, attempts FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, kind, payload, attempts = row
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, worker_id = ?, heartbeat_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (RUNNING, worker_id, time.time(), datetime.now().isoformat(), job_id, QUEUED)
+            )
+            if not cursor.rowcount:
+                return None
+        return {'id': job_id, 'kind': kind, 'payload': json.loads(payload), 'attempts': attempts + 1}
+
+    def set_progress(self, job_id: str, progress: float, message: str = "") -> None:
+        """Record how far a running job has got"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET progress = ?, message = ?, updated_at = ? WHERE id = ?",
+                (progress, message, datetime.now().isoformat(), job_id)
+            )
+
+    def complete(self, job_id: str, result: Dict) -> None:
+        """Mark a job as done"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, progress = 1, result = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (DONE, json.dumps(result), datetime.now().isoformat(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Requeue a failed job, or mark it failed once it has used up its attempts"""
+        with self._lock, self.conn:
+            attempts = self.conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            status = QUEUED if attempts < self.max_attempts else FAILED
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error, datetime.now().isoformat(), job_id)
+            )
+        if status == QUEUED:
+            self.logger.warning(f"Job {job_id} failed (attempt {attempts}), retrying: {error}")
+        else:
+            self.logger.error(f"Job {job_id} failed after {attempts} attempts: {error}")
+
+    def heartbeat(self, worker_id: str) -> None:
+        """Show that a worker is still alive and running its claimed jobs"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE worker_id = ? AND status = ?",
+                (time.time(), worker_id, RUNNING)
+            )
+
+    def recover(self, stale_after: float) -> int:
+        """Requeue running jobs whose worker has not sent a heartbeat for stale_after seconds"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, updated_at = ? "
+                "WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (QUEUED, datetime.now().isoformat(), RUNNING, time.time() - stale_after)
+            )
+        return cursor.rowcount
+
+    def prune(self, retention_days: float = JOB_RETENTION_DAYS) -> int:
+        """Delete finished and failed jobs last updated more than retention_days ago"""
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, cutoff)
+            )
+        return cursor.rowcount
+
+    def retry(self, job_id: str) -> None:
+        """Queue a failed job again with a fresh set of attempts"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, progress = 0, updated_at = ? WHERE id = ? AND status = ?",
+                (QUEUED, datetime.now().isoformat(), job_id, FAILED)
+            )
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """Most recently created jobs, newest first"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, kind, label, status, progress, message, result, error, attempts, created_at, updated_at "
+                "FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [
+            {
+                'id': job_id, 'kind': kind, 'label': label, 'status': status, 'progress': progress,
+                'message': message, 'result': json.loads(result) if result else None, 'error': error,
+                'attempts': attempts, 'created_at': created_at, 'updated_at': updated_at
+            }
+            for job_id, kind, label, status, progress, message, result, error, attempts, created_at, updated_at
+            in rows
+        ]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each status"""
+        with self._lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+            return {status: count for status, count in rows}
+
+
+class JobWorkers:
+    """Daemon threads that run queued jobs through a handler per job kind.
+
+    A handler is called as handler(payload, report_progress) and returns a result dict;
+    report_progress(fraction, message) updates the job row that the UI polls. A
+    heartbeat thread keeps this pool's running jobs marked alive, requeues jobs of
+    pools that stopped sending heartbeats and prunes old finished jobs.
+    """
+
+    def __init__(self, job_queue: JobQueue, handlers: Dict[str, Callable], workers: int,
+                 poll_interval: float = JOB_POLL_INTERVAL, heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL):
+        self.logger = get_logger(__name__)
+        self.job_queue = job_queue
+        self.handlers = handlers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self.threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def notify(self) -> None:
+        """Wake idle workers after a job has been enqueued"""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop claiming jobs; jobs already running are finished first"""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            job = self.job_queue.claim(self.worker_id)
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+
+            self.logger.info(f"Running {job['kind']} job {job['id']} (attempt {job['attempts']})")
+            started = time.perf_counter()
+            try:
+                result = self.handlers[job['kind']](
+                    job['payload'],
+                    lambda progress, message="": self.job_queue.set_progress(job['id'], progress, message)
+                )
+            except Exception as e:
+                self.logger.error(f"Error running job {job['id']}: {str(e)}", exc_info=True)
+                self.job_queue.fail(job['id'], str(e))
+                continue
+            self.job_queue.complete(job['id'], result)
+            self.logger.info(f"Finished job {job['id']} in {time.perf_counter() - started:.1f}s")
+
+    def _heartbeat(self) -> None:
+        # Keep beating until the last worker has finished its job, even after stop()
+        while any(thread.is_alive() for thread in self.threads):
+            try:
+                self.job_queue.heartbeat(self.worker_id)
+                recovered = self.job_queue.recover(stale_after=self.heartbeat_interval * STALE_HEARTBEATS)
+                if recovered:
+                    self.logger.info(f"Requeued {recovered} jobs from workers that stopped responding")
+                self.job_queue.prune()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Job heartbeat failed: {e}")
+            time.sleep(self.heartbeat_interval)
+
+
+def start_job_workers(job_queue: JobQueue, handlers: Dict[str, Callable], workers: int) -> JobWorkers:
+    """Start the process's job workers, stopping any pool started earlier (e.g. before a cache reset)"""
+    global _active_workers
+    with _workers_lock:
+        if _active_workers is not None:
+            _active_workers.stop(timeout=0)
+        _active_workers = JobWorkers(job_queue, handlers, workers)
+        return _active_workers
@@ -1,52 +1,280 @@
 import ollama
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
-from config.settings import OLLAMA_BASE_URL, MODEL_NAME
+from typing import Dict, Iterator, List, Optional
+from config.settings import (
+    OLLAMA_BASE_URL, LLM_ROUTES, LLM_PARALLEL_REQUESTS, KEEP_ALIVE, WARM_UP_ON_START,
+    KEEP_WARM_INTERVAL, SUMMARY_DIRECT_MAX_TOKENS, SUMMARY_CHUNK_TOKENS, SUMMARY_PARALLELISM
+)
+from core.chunker import TextChunker
+from core.event_log import SUMMARY_GENERATED, get_event_log
+from core.llm_metrics import LLMMetrics
+from core.response_cache import ResponseCache
 from utils.logger import get_logger
+from utils.token_utils import TokenUtils
+
+# Bump whenever a prompt template changes so cached responses are not reused
+PROMPT_TEMPLATE_VERSION = 1
+
+# Prefix of the text returned in place of a response when generation fails
+ERROR_PREFIX = "Error generating response"
+
+# Load times above this are logged as cold starts
+COLD_START_LOG_SECONDS = 1.0
+
+_warmer_lock = threading.Lock()
+_warmer_thread = None
+
+
+class _StreamRecorder:
+    """Bookkeeping for one streamed chat response, shared by the sync and async streams"""
+
+    def __init__(self, llm_handler, route: Dict, cache_key: str):
+        self.llm_handler = llm_handler
+        self.route = route
+        self.cache_key = cache_key
+        self.started = time.perf_counter()
+        self.ttft = None
+        self.pieces = []
+
+    def consume(self, part) -> str:
+        """Record a streamed part and return its content"""
+        content = part['message']['content']
+        if content and self.ttft is None:
+            self.ttft = time.perf_counter() - self.started
+        if part.get('done'):
+            self.llm_handler._log_load_time(self.route['model'], part)
+            self.llm_handler.metrics.record(self.route['model'], "chat", part, ttft_seconds=self.ttft, streamed=True)
+        if content:
+            self.pieces.append(content)
+        return content
+
+    def finish(self) -> None:
+        """Record the latency of a completed stream and cache the full answer"""
+        self.llm_handler._record_latency("chat", time.perf_counter() - self.started)
+        self.llm_handler.logger.info("Response streamed successfully")
+        self.llm_handler.response_cache.put(self.cache_key, "".join(self.pieces))
 
 
 class LLMHandler:
     def __init__(self):
         self.logger = get_logger(__name__)
-        self.logger.info(f"Initializing LLMHandler with model: {MODEL_NAME}")
+        self.logger.info(f"Initializing LLMHandler with model: {LLM_ROUTES['chat']['model']}")
         self.client = ollama.Client(host=OLLAMA_BASE_URL)
-        self.model_name = MODEL_NAME
+        # Task type -> model and generation options; cheap bulk tasks can use a smaller model
+        self.routes = LLM_ROUTES
+        self.model_name = LLM_ROUTES['chat']['model']
+        self.response_cache = ResponseCache()
+        self.metrics = LLMMetrics()
+        self.event_log = get_event_log()
+        self._route_stats = {task: {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0} for task in self.routes}
+        self._stats_lock = threading.Lock()
+        # Ollama serves a fixed number of requests in parallel; queue the rest here
+        self._slots = threading.BoundedSemaphore(LLM_PARALLEL_REQUESTS)
 
-    def generate_response(self, prompt: str, context: str = "") -> str:
-        """Generate response using DeepSeek model"""
-        self.logger.info(f"Generating response for prompt: {prompt[:50]}...")
-        try:
-            full_prompt = f"""
-            Context: {context}
+    def route(self, task: str) -> Dict:
+        """Model and generation options configured for a task type"""
+        return self.routes[task]
+
+    def route_models(self) -> List[str]:
+        """Distinct models used by any route"""
+        return list(dict.fromkeys(route['model'] for route in self.routes.values()))
+
+    def _record_latency(self, task: str, seconds: float) -> None:
+        with self._stats_lock:
+            stats = self._route_stats[task]
+            stats['calls'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+    def route_stats(self) -> Dict[str, Dict]:
+        """Per-route call counts and latencies of model requests (cache hits excluded)"""
+        with self._stats_lock:
+            return {
+                task: {
+                    'model': self.routes[task]['model'],
+                    'calls': stats['calls'],
+                    'avg_seconds': stats['total_seconds'] / stats['calls'] if stats['calls'] else 0.0,
+                    'max_seconds': stats['max_seconds']
+                }
+                for task, stats in self._route_stats.items()
+            }
+
+    def _cache_key(self, full_prompt: str, route: Dict) -> str:
+        return ResponseCache.make_key(
+            model=route['model'],
+            options=route['options'],
+            template_version=PROMPT_TEMPLATE_VERSION,
+            prompt=full_prompt
+        )
+
+    def _cached_response(self, cache_key: str, use_cache: bool) -> Optional[str]:
+        if not use_cache:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self.logger.info("Returning cached response")
+        return cached
+
+    def _record_completion(self, task: str, route: Dict, cache_key: str, response) -> str:
+        """Record metrics for a finished non-streaming response, cache it and return its content"""
+        self._log_load_time(route['model'], response)
+        self.metrics.record(route['model'], task, response)
+        self.logger.info("Response generated successfully")
+        self.response_cache.put(cache_key, response['message']['content'])
+        return response['message']['content']
+
+    def warm_up(self, model: str = None) -> float:
+        """Load a model into Ollama's memory ahead of the first request and return the load time in seconds"""
+        model = model or self.model_name
+        started = time.perf_counter()
+        # An empty prompt makes Ollama load the model without generating anything
+        response = self.client.generate(model=model, prompt="", keep_alive=KEEP_ALIVE)
+        load_seconds = (response.get('load_duration') or 0) / 1e9
+        self.logger.info(
+            f"Warmed up {model}: load {load_seconds:.2f}s, total {time.perf_counter() - started:.2f}s"
+        )
+        return load_seconds
 
+    def _log_load_time(self, model: str, response) -> None:
+        """Log model load time reported by Ollama so cold starts are visible"""
+        load_seconds = (response.get('load_duration') or 0) / 1e9
+        if load_seconds >= COLD_START_LOG_SECONDS:
+            self.logger.warning(f"Cold start: {model} took {load_seconds:.2f}s to load")
+        else:
+            self.logger.debug(f"{model} load time {load_seconds:.3f}s")
+
+    def _build_prompt(self, prompt: str, context: str = "", history: str = "") -> str:
+        """Wrap the user query with retrieved context and, in follow-up turns, the conversation so far"""
+        history_block = f"\n            Conversation so far:\n{history}\n" if history else ""
+        return f"""
+            Context: {context}
+{history_block}
             User Query: {prompt}
 
             Please provide a comprehensive and accurate response based on the context provided.
             If you need to cite sources, use proper academic citation format.
             """
 
-            self.logger.debug(f"Sending request to model: {self.model_name}")
+    def generate_response(self, prompt: str, context: str = "", use_cache: bool = True, task: str = "chat") -> str:
+        """Generate response using the model routed for the task"""
+        self.logger.info(f"Generating response for prompt: {prompt[:50]}...")
+        try:
+            return self._complete(self._build_prompt(prompt, context), task, use_cache)
+        except Exception as e:
+            self.logger.error(f"Error generating response: {str(e)}", exc_info=True)
+            return f"{ERROR_PREFIX}: {str(e)}"
+
+    def _complete(self, full_prompt: str, task: str, use_cache: bool = True) -> str:
+        """Run a single non-streaming completion through the response cache; errors are raised"""
+        route = self.route(task)
+        cache_key = self._cache_key(full_prompt, route)
+        cached = self._cached_response(cache_key, use_cache)
+        if cached is not None:
+            return cached
+
+        self.logger.debug(f"Sending {task} request to model: {route['model']}")
+        with self._slots:
+            started = time.perf_counter()
             response = self.client.chat(
-                model=self.model_name,
+                model=route['model'],
                 messages=[{
                     'role': 'user',
                     'content': full_prompt
                 }],
-                stream=False
+                stream=False,
+                options=route['options'],
+                keep_alive=KEEP_ALIVE
             )
+            self._record_latency(task, time.perf_counter() - started)
+
+        return self._record_completion(task, route, cache_key, response)
 
-            self.logger.info("Response generated successfully")
-            return response['message']['content']
+    def stream_response(self, prompt: str, context: str = "", use_cache: bool = True,
+                        history: str = "") -> Iterator[str]:
+        """Generate a response incrementally, yielding content pieces as the model produces them"""
+        self.logger.info(f"Streaming response for prompt: {prompt[:50]}...")
+        try:
+            full_prompt = self._build_prompt(prompt, context, history)
+
+            route = self.route("chat")
+            cache_key = self._cache_key(full_prompt, route)
+            cached = self._cached_response(cache_key, use_cache)
+            if cached is not None:
+                yield cached
+                return
+
+            self.logger.debug(f"Sending streaming request to model: {route['model']}")
+            # The slot is held until the stream ends (or the consumer closes the generator), so chat
+            # sessions and background summarization share Ollama's parallel slots
+            with self._slots:
+                recorder = _StreamRecorder(self, route, cache_key)
+                stream = self.client.chat(
+                    model=route['model'],
+                    messages=[{
+                        'role': 'user',
+                        'content': full_prompt
+                    }],
+                    stream=True,
+                    options=route['options'],
+                    keep_alive=KEEP_ALIVE
+                )
+
+                for part in stream:
+                    content = recorder.consume(part)
+                    if content:
+                        yield content
+
+                recorder.finish()
         except Exception as e:
-            self.logger.error(f"Error generating response: {str(e)}", exc_info=True)
-            return f"Error generating response: {str(e)}"
+            self.logger.error(f"Error streaming response: {str(e)}", exc_info=True)
+            yield f"{ERROR_PREFIX}: {str(e)}"
 
-    def summarize_paper(self, paper_content: str, title: str = "") -> Dict:
+    def summarize_paper(self, paper_content: str, title: str = "", use_cache: bool = True) -> Dict:
         """Generate paper summary with key insights"""
         self.logger.info(f"Summarizing paper: {title if title else 'Untitled'}")
         self.logger.debug(f"Paper content length: {len(paper_content)} characters")
+        started = time.perf_counter()
 
-        prompt = f"""
+        if TokenUtils.count_tokens(paper_content) <= SUMMARY_DIRECT_MAX_TOKENS:
+            method, chunk_count = "direct", 1
+            summary = self.generate_response(self._summary_prompt(title, paper_content), use_cache=use_cache,
+                                             task="summarize_reduce")
+        else:
+            method = "map_reduce"
+            try:
+                chunk_summaries = self._summarize_chunks(paper_content, title, use_cache)
+                chunk_count = len(chunk_summaries)
+                notes = self._condense(chunk_summaries, title, use_cache)
+                summary = self.generate_response(self._summary_prompt(title, notes, from_notes=True),
+                                                 use_cache=use_cache, task="summarize_reduce")
+            except Exception as e:
+                self.logger.error(f"Error summarizing paper: {str(e)}", exc_info=True)
+                chunk_count = 0
+                summary = f"{ERROR_PREFIX}: {str(e)}"
+
+        result = {
+            "title": title,
+            "model": self.route("summarize_reduce")['model'],
+            "success": not summary.startswith(ERROR_PREFIX),
+            "summary": summary,
+            "method": method,
+            "chunks": chunk_count,
+            "generated_at": datetime.now().isoformat()
+        }
+        if result["success"]:
+            self.event_log.record(SUMMARY_GENERATED, title, time.perf_counter() - started,
+                                  method=method, chunks=chunk_count)
+
+        self.logger.info(f"Paper summary generated successfully for: {title if title else 'Untitled'}")
+        return result
+
+    def _summary_prompt(self, title: str, content: str, from_notes: bool = False) -> str:
+        """Prompt for the final six-part structured summary"""
+        source = "Notes on each part of the paper" if from_notes else "Content"
+        return f"""
         Analyze the following research paper and provide:
         1. Main research question/hypothesis
         2. Key methodology used
@@ -56,23 +284,85 @@ class LLMHandler:
         6. Future research directions suggested
 
         Paper Title: {title}
-        Content: {paper_content}
+        {source}: {content}
 
         Format your response as a structured summary.
         """
 
-        summary = self.generate_response(prompt)
+    def _summarize_chunks(self, paper_content: str, title: str, use_cache: bool) -> List[str]:
+        """Map step: summarize each section-aware chunk with bounded parallelism"""
+        chunker = TextChunker(chunk_size=SUMMARY_CHUNK_TOKENS, chunk_overlap=0)
+        chunks = [chunk for chunk in chunker.chunk_text(paper_content) if chunk['section'] != 'references']
+        self.logger.info(
+            f"Summarizing {len(chunks)} chunks of {title or 'Untitled'} with {self.route('summarize_chunk')['model']}"
+        )
 
-        result = {
-            "title": title,
-            "summary": summary,
-            "generated_at": datetime.now().isoformat()
-        }
+        def summarize_chunk(chunk: Dict) -> str:
+            prompt = f"""
+        The following is the {chunk['section'].replace('_', ' ')} part of the research paper "{title}".
+        Write concise notes covering its research questions, methods, results, limitations and
+        future work, keeping specific names, numbers and datasets.
 
-        self.logger.info(f"Paper summary generated successfully for: {title if title else 'Untitled'}")
-        return result
+        Text: {chunk['content']}
+        """
+            return f"[{chunk['section']}] " + self._complete(prompt, "summarize_chunk", use_cache)
+
+        with ThreadPoolExecutor(max_workers=SUMMARY_PARALLELISM) as executor:
+            return list(executor.map(summarize_chunk, chunks))
+
+    def _condense(self, summaries: List[str], title: str, use_cache: bool) -> str:
+        """Merge chunk notes in groups until they fit into a single reduce prompt"""
+        while True:
+            notes = "\n\n".join(summaries)
+            if TokenUtils.count_tokens(notes) <= SUMMARY_DIRECT_MAX_TOKENS or len(summaries) == 1:
+                return notes
 
-    def suggest_research_directions(self, topic: str, current_papers: List[str]) -> List[str]:
+            groups, group, group_tokens = [], [], 0
+            for summary in summaries:
+                tokens = TokenUtils.count_tokens(summary)
+                if group and group_tokens + tokens > SUMMARY_CHUNK_TOKENS:
+                    groups.append(group)
+                    group, group_tokens = [], 0
+                group.append(summary)
+                group_tokens += tokens
+            groups.append(group)
+            if len(groups) == len(summaries):
+                # Each note is already too large to merge; condense them pairwise
+                groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+
+            def merge(group: List[str]) -> str:
+                prompt = f"""
+        Combine the following notes on parts of the research paper "{title}" into one set of
+        concise notes, keeping specific names, numbers and datasets.
+
+        Notes: {chr(10).join(group)}
+        """
+                return self._complete(prompt, "summarize_chunk", use_cache)
+
+            self.logger.info(f"Condensing {len(summaries)} chunk notes into {len(groups)}")
+            with ThreadPoolExecutor(max_workers=SUMMARY_PARALLELISM) as executor:
+                summaries = list(executor.map(merge, groups))
+
+    def summarize_conversation(self, previous_summary: str, turns: str, max_tokens: int) -> str:
+        """Fold older chat turns into a conversation's rolling summary"""
+        prompt = f"""
+        Update the summary of a research conversation with the new turns below.
+        Keep the questions asked, the papers and findings discussed and any conclusions reached.
+        Use at most {max_tokens} tokens (roughly {max_tokens * 3 // 4} words).
+
+        Current summary: {previous_summary or "(none)"}
+
+        New turns:
+        {turns}
+        """
+        try:
+            return self._complete(prompt, "summarize_chunk")
+        except Exception as e:
+            self.logger.error(f"Error summarizing conversation: {str(e)}", exc_info=True)
+            return f"{ERROR_PREFIX}: {str(e)}"
+
+    def suggest_research_directions(self, topic: str, current_papers: List[str],
+                                    use_cache: bool = True) -> List[str]:
         """Suggest new research directions based on current work"""
         self.logger.info(f"Suggesting research directions for topic: {topic}")
         self.logger.debug(f"Using {len(current_papers)} papers as context")
@@ -87,10 +377,45 @@ class LLMHandler:
         Provide specific, actionable research questions or directions.
         """
 
-        response = self.generate_response(prompt)
+        response = self.generate_response(prompt, use_cache=use_cache, task="directions")
         directions = response.split('\n')
 
         self.logger.info(f"Generated {len(directions)} research directions for topic: {topic}")
         self.logger.debug(f"Research directions: {directions}")
 
         return directions
+
+    def cache_stats(self) -> Dict:
+        """Response cache hit-rate statistics"""
+        return self.response_cache.stats()
+
+
+def start_model_warmer(llm_handler: LLMHandler) -> None:
+    """Start the process-wide background thread that warms up and keeps the models loaded.
+
+    The thread preloads the models once at startup (llm.warm_up_on_start) and then re-pings them
+    every llm.keep_warm_interval seconds so Ollama never unloads them between requests.
+    Calling this again is a no-op.
+    """
+    global _warmer_thread
+    with _warmer_lock:
+        if _warmer_thread is not None or not (WARM_UP_ON_START or KEEP_WARM_INTERVAL > 0):
+            return
+
+        def run():
+            models = llm_handler.route_models()
+            first = True
+            while True:
+                if not first or WARM_UP_ON_START:
+                    for model in models:
+                        try:
+                            llm_handler.warm_up(model)
+                        except Exception as e:
+                            llm_handler.logger.warning(f"Could not warm up {model}: {str(e)}")
+                if KEEP_WARM_INTERVAL <= 0:
+                    return
+                first = False
+                time.sleep(KEEP_WARM_INTERVAL)
+
+        _warmer_thread = threading.Thread(target=run, name="model-warmer", daemon=True)
+        _warmer_thread.start()
@@ -0,0 +1,114 @@
+import csv
+import io
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import LLM_METRICS_PATH, LLM_METRICS_MAX_RECORDS
+from utils.logger import get_logger
+
+# Ollama reports durations in nanoseconds
+NANOSECONDS = 1e9
+
+COLUMNS = [
+    'recorded_at', 'model', 'task', 'streamed', 'prompt_tokens', 'eval_tokens', 'load_seconds',
+    'prompt_eval_seconds', 'eval_seconds', 'total_seconds', 'ttft_seconds', 'tokens_per_second'
+]
+
+
+class LLMMetrics:
+    """Rolling store of per-call Ollama timing and token counts, persisted in SQLite"""
+
+    def __init__(self, metrics_path: Path = LLM_METRICS_PATH, max_records: int = LLM_METRICS_MAX_RECORDS):
+        self.logger = get_logger(__name__)
+        self.max_records = max_records
+        os.makedirs(Path(metrics_path).parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(metrics_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS calls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recorded_at REAL NOT NULL,
+                model TEXT NOT NULL,
+                task TEXT NOT NULL,
+                streamed INTEGER NOT NULL,
+                prompt_tokens INTEGER NOT NULL,
+                eval_tokens INTEGER NOT NULL,
+                load_seconds REAL NOT NULL,
+                prompt_eval_seconds REAL NOT NULL,
+                eval_seconds REAL NOT NULL,
+                total_seconds REAL NOT NULL,
+                ttft_seconds REAL NOT NULL,
+                tokens_per_second REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def record(self, model: str, task: str, response, ttft_seconds: Optional[float] = None,
+               streamed: bool = False) -> None:
+        """Store the metadata of a final Ollama response; TTFT defaults to load plus prompt evaluation time"""
+        try:
+            load_seconds = (response.get('load_duration') or 0) / NANOSECONDS
+            prompt_eval_seconds = (response.get('prompt_eval_duration') or 0) / NANOSECONDS
+            eval_seconds = (response.get('eval_duration') or 0) / NANOSECONDS
+            eval_tokens = response.get('eval_count') or 0
+            row = (
+                time.time(), model, task, int(streamed), response.get('prompt_eval_count') or 0, eval_tokens,
+                load_seconds, prompt_eval_seconds, eval_seconds,
+                (response.get('total_duration') or 0) / NANOSECONDS,
+                ttft_seconds if ttft_seconds is not None else load_seconds + prompt_eval_seconds,
+                eval_tokens / eval_seconds if eval_seconds else 0.0
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not read response metrics: {e}")
+            return
+
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                f"INSERT INTO calls ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", row
+            )
+            self.conn.execute("DELETE FROM calls WHERE id <= ?", (cursor.lastrowid - self.max_records,))
+
+    def recent(self, limit: int = 100) -> List[Dict]:
+        """Most recent calls, newest first"""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM calls ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def summary(self) -> List[Dict]:
+        """Averages per model and task over the retained calls"""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT model, task, COUNT(*), AVG(tokens_per_second), AVG(ttft_seconds), MAX(ttft_seconds),
+                       AVG(prompt_tokens), AVG(eval_tokens), AVG(load_seconds), MAX(load_seconds)
+                FROM calls GROUP BY model, task ORDER BY model, task
+            """).fetchall()
+        return [
+            {
+                'model': model,
+                'task': task,
+                'calls': calls,
+                'avg_tokens_per_second': avg_tps,
+                'avg_ttft_seconds': avg_ttft,
+                'max_ttft_seconds': max_ttft,
+                'avg_prompt_tokens': avg_prompt,
+                'avg_eval_tokens': avg_eval,
+                'avg_load_seconds': avg_load,
+                'max_load_seconds': max_load
+            }
+            for model, task, calls, avg_tps, avg_ttft, max_ttft, avg_prompt, avg_eval, avg_load, max_load in rows
+        ]
+
+    def to_csv(self) -> str:
+        """All retained calls as CSV, oldest first"""
+        with self._lock:
+            rows = self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM calls ORDER BY id").fetchall()
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+        return output.getvalue()
@@ -0,0 +1,85 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+from config.settings import PAPER_CATALOG_PATH
+from utils.logger import get_logger
+
+# Sort options offered to the UI, mapped to ORDER BY clauses
+SORT_ORDERS = {
+    'newest': "processed_at DESC",
+    'oldest': "processed_at ASC",
+    'title': "title COLLATE NOCASE ASC",
+    'longest': "word_count DESC",
+}
+
+
+class PaperCatalog:
+    """Paper-level metadata kept in SQLite so listings can be searched, sorted and paged without Chroma"""
+
+    def __init__(self, catalog_path: Path = PAPER_CATALOG_PATH):
+        self.logger = get_logger(__name__)
+        os.makedirs(Path(catalog_path).parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(catalog_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS papers (
+                paper_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                filename TEXT,
+                word_count INTEGER,
+                processed_at TEXT,
+                metadata TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_papers_processed ON papers (processed_at);
+            CREATE INDEX IF NOT EXISTS idx_papers_title ON papers (title COLLATE NOCASE);
+        """)
+        self.conn.commit()
+
+    def upsert(self, papers: Iterable[Tuple[str, Dict]]) -> None:
+        """Add or replace (paper_id, metadata) entries"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO papers (paper_id, title, filename, word_count, processed_at, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (paper_id, metadata.get('title', paper_id), metadata.get('filename'),
+                     metadata.get('word_count'), metadata.get('processed_at'), json.dumps(metadata))
+                    for paper_id, metadata in papers
+                )
+            )
+
+    def remove(self, paper_id: str) -> None:
+        """Remove a paper from the catalog"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM papers WHERE paper_id = ?", (paper_id,))
+
+    def clear(self) -> None:
+        """Remove every paper, e.g. before rebuilding from the collection"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM papers")
+
+    def count(self, search: str = "") -> int:
+        """Number of papers whose title or filename contains the search text"""
+        where, params = self._filter(search)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM papers{where}", params).fetchone()[0]
+
+    def page(self, search: str = "", sort: str = 'newest', offset: int = 0, limit: int = 20) -> List[Dict]:
+        """One page of papers as {'id', 'metadata'} dicts"""
+        where, params = self._filter(search)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT paper_id, metadata FROM papers{where} ORDER BY {SORT_ORDERS[sort]} LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+        return [{'id': paper_id, 'metadata': json.loads(metadata)} for paper_id, metadata in rows]
+
+    @staticmethod
+    def _filter(search: str) -> Tuple[str, tuple]:
+        if not search:
+            return "", ()
+        pattern = f"%{search}%"
+        return " WHERE title LIKE ? OR filename LIKE ?", (pattern, pattern)
@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Callable, Dict
+from core.paper_processor import extract_citations
+from utils.logger import get_logger
+
+PROCESS_PAPER = 'process_paper'
+
+
+class PaperJobHandler:
+    """Runs an uploaded paper through extraction, indexing, summarization and citation extraction"""
+
+    def __init__(self, paper_processor, vector_store, summary_store, llm_handler):
+        self.logger = get_logger(__name__)
+        self.paper_processor = paper_processor
+        self.vector_store = vector_store
+        self.summary_store = summary_store
+        self.llm_handler = llm_handler
+
+    def stage_upload(self, filename: str, data: bytes) -> Dict:
+        """Persist uploaded bytes so a job can read them after the script run ends"""
+        content_hash = self.paper_processor.ingest_cache.content_hash(data)
+        blob_path = self.paper_processor.ingest_cache.store_blob(content_hash, data, Path(filename).suffix)
+        return {'filename': filename, 'blob_path': str(blob_path)}
+
+    def __call__(self, payload: Dict, report_progress: Callable) -> Dict:
+        """Process one staged upload; raises so the queue can retry"""
+        filename = payload['filename']
+        report_progress(0.1, "Extracting text")
+        with open(payload['blob_path'], 'rb') as f:
+            result = self.paper_processor.process_bytes(filename, f.read())
+        if not result['success']:
+            raise RuntimeError(result['error'])
+
+        report_progress(0.4, "Indexing")
+        if not self.vector_store.has_paper(result['id']):
+            if not self.vector_store.add_paper(result['id'], result['chunks']):
+                raise RuntimeError("Failed to add to vector store")
+
+        outcome = {
+            'paper_id': result['id'],
+            'title': result['title'],
+            'cached': result['cached'],
+            'pages': result['extraction']['pages'],
+            'summary': None,
+            'citations': None
+        }
+
+        summary_model = self.llm_handler.route('summarize_reduce')['model']
+        if payload.get('generate_summary') and self.summary_store.get(result['id'], summary_model) is None:
+            report_progress(0.6, "Summarizing")
+            summary = self.llm_handler.summarize_paper(result['content'], result['title'])
+            if summary['success']:
+                self.summary_store.save(result['id'], summary)
+            outcome['summary'] = 'generated' if summary['success'] else summary['summary']
+
+        if payload.get('extract_citations'):
+            report_progress(0.9, "Extracting citations")
+            outcome['citations'] = len(extract_citations(result))
+
+        return outcome
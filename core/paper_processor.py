@@ -1,36 +1,102 @@
 from PyPDF2 import PdfReader
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 import hashlib
-from config.settings import PAPERS_DIR
+import re
+import threading
+import time
+from config.settings import PDF_WORKERS, PDF_PAGES_PER_TASK, PDF_PARALLEL_MIN_PAGES
+from core.chunker import TextChunker
+from core.ingest_cache import IngestCache
+from utils.logger import get_logger
+
+# Author-year citations like (Author, 2020) or [Author, 2020]
+CITATION_PATTERNS = [
+    re.compile(r'\([A-Z][a-zA-Z\s&,]+,\s*\d{4}\)'),
+    re.compile(r'\[[A-Z][a-zA-Z\s&,]+,\s*\d{4}\]'),
+]
+
+
+def _extract_page_range(file_path: str, start: int, end: Optional[int] = None) -> List[Tuple[int, str, float]]:
+    """Extract (page_number, text, seconds) for pages [start, end) of a PDF; end=None means the last page"""
+    pages = []
+    with open(file_path, 'rb') as file:
+        pdf_reader = PdfReader(file)
+        for page_number in range(start, len(pdf_reader.pages) if end is None else end):
+            started = time.perf_counter()
+            text = pdf_reader.pages[page_number].extract_text() or ""
+            pages.append((page_number, text, time.perf_counter() - started))
+    return pages
+
+
+def extract_citations(paper_result: Dict, limit: int = 10) -> List[Dict]:
+    """Extract in-text citations from a processed paper (simple pattern matching)"""
+    citations = []
+    for pattern in CITATION_PATTERNS:
+        for match in pattern.findall(paper_result['content']):
+            citations.append({
+                'raw_text': match,
+                'extracted_from': paper_result['title']
+            })
+    return citations[:limit]
 
 
 class PaperProcessor:
-    def __init__(self):
-        self.papers_dir = PAPERS_DIR
-
-    def process_uploaded_file(self, uploaded_file) -> Dict:
-        """Process uploaded research paper"""
+    def __init__(self, executor: Optional[Executor] = None, max_workers: int = PDF_WORKERS,
+                 extract_in_pool: bool = False):
+        self.logger = get_logger(__name__)
+        self.ingest_cache = IngestCache()
+        self.chunker = TextChunker()
+        self.max_workers = max_workers
+        # Callers processing many files from threads (bulk ingest) extract every PDF in the process
+        # pool, since PyPDF2 holds the GIL and in-thread extraction would not run in parallel
+        self.extract_in_pool = extract_in_pool
+        self._executor = executor
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        """Process pool used for PDF extraction, created on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def process_bytes(self, filename: str, data: bytes) -> Dict:
+        """Process raw paper bytes, reusing the cached extraction for previously seen content"""
         try:
-            file_path = self.papers_dir / uploaded_file.name
-            with open(file_path, 'wb') as f:
-                f.write(uploaded_file.getvalue())
+            content_hash = self.ingest_cache.content_hash(data)
 
-            content = self._extract_content(file_path)
+            cached = self.ingest_cache.get(content_hash)
+            if cached is not None:
+                self.logger.info(f"Ingest cache hit for {filename} ({cached['id']})")
+                return self._build_result(cached, cached=True)
 
-            paper_id = self._generate_paper_id(uploaded_file.name, content)
+            file_path = self.ingest_cache.store_blob(content_hash, data, Path(filename).suffix)
 
-            metadata = self._extract_metadata(uploaded_file.name, content)
+            content, extraction = self._extract_content(file_path)
 
-            return {
+            paper_id = self._generate_paper_id(filename, content)
+
+            metadata = self._extract_metadata(filename, content)
+            metadata['page_count'] = extraction['pages']
+            metadata['extraction_seconds'] = round(extraction['seconds'], 3)
+            metadata['content_hash'] = content_hash
+
+            record = {
                 'id': paper_id,
-                'title': metadata.get('title', uploaded_file.name),
+                'title': metadata.get('title', filename),
                 'content': content,
                 'metadata': metadata,
+                'extraction': extraction,
                 'file_path': str(file_path),
-                'success': True
+                'content_hash': content_hash
             }
+            self.ingest_cache.put(content_hash, record)
+
+            return self._build_result(record, cached=False)
 
         except Exception as e:
             return {
@@ -38,26 +104,63 @@ class PaperProcessor:
                 'error': str(e)
             }
 
-    def _extract_content(self, file_path: Path) -> str:
-        """Extract text content from different file formats"""
+    def _build_result(self, record: Dict, cached: bool) -> Dict:
+        """Attach chunks and status flags to an extraction record"""
+        return {
+            **record,
+            'chunks': self.chunker.chunk_paper(record['id'], record['content'], record['metadata']),
+            'cached': cached,
+            'success': True
+        }
+
+    def _extract_content(self, file_path: Path) -> Tuple[str, Dict]:
+        """Extract text content and extraction timings from different file formats"""
         file_extension = file_path.suffix.lower()
+        started = time.perf_counter()
 
         if file_extension == '.pdf':
-            return self._extract_pdf_content(file_path)
+            content, page_seconds = self._extract_pdf_content(file_path)
         elif file_extension == '.txt':
-            return self._extract_txt_content(file_path)
+            content = self._extract_txt_content(file_path)
+            page_seconds = [time.perf_counter() - started]
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
 
-    def _extract_pdf_content(self, file_path: Path) -> str:
-        """Extract text from PDF file"""
-        text = ""
+        extraction = {
+            'pages': len(page_seconds),
+            'seconds': time.perf_counter() - started,
+            'page_seconds': page_seconds
+        }
+        self.logger.info(
+            f"Extracted {extraction['pages']} pages from {file_path.name} in {extraction['seconds']:.2f}s"
+        )
+        return content, extraction
+
+    def _extract_pdf_content(self, file_path: Path) -> Tuple[str, List[float]]:
+        """Extract text from PDF file, fanning page ranges out to the process pool for long papers"""
+        if self.extract_in_pool:
+            # Parallelism comes from extracting many files at once, so each file is one task
+            pages = self.executor.submit(_extract_page_range, str(file_path), 0).result()
+            return "\n".join(text for _, text, _ in pages), [seconds for _, _, seconds in pages]
+
         with open(file_path, 'rb') as file:
-            pdf_reader = PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+            page_count = len(PdfReader(file).pages)
 
+        if self.max_workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+            pages = _extract_page_range(str(file_path), 0, page_count)
+        else:
+            futures = [
+                self.executor.submit(_extract_page_range, str(file_path), start,
+                                     min(start + PDF_PAGES_PER_TASK, page_count))
+                for start in range(0, page_count, PDF_PAGES_PER_TASK)
+            ]
+            pages = [page for future in futures for page in future.result()]
+
+        slowest = max(pages, key=lambda page: page[2], default=None)
+        if slowest:
+            self.logger.debug(f"Slowest page in {file_path.name}: {slowest[0] + 1} ({slowest[2]:.3f}s)")
+
+        return "\n".join(text for _, text, _ in pages), [seconds for _, _, seconds in pages]
 
     def _extract_txt_content(self, file_path: Path) -> str:
         """Extract text from TXT file"""
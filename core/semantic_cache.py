@@ -0,0 +1,80 @@
+import hashlib
+import time
+import uuid
+from typing import Dict, List, Optional
+from config.settings import SEMANTIC_CACHE_THRESHOLD
+from utils.logger import get_logger
+
+
+class SemanticCache:
+    """Prior answers looked up by question similarity, scoped to the retrieved papers and collection generation"""
+
+    def __init__(self, client, similarity_threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.logger = get_logger(__name__)
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.misses = 0
+        # Cosine space so that distance = 1 - similarity
+        self.collection = client.get_or_create_collection(
+            name="response_cache",
+            metadata={"description": "Answers to previous chat questions", "hnsw:space": "cosine"}
+        )
+
+    @staticmethod
+    def scope_key(paper_ids: List[str], model: str, template_version: int) -> str:
+        """Identify the inputs besides the question that an answer depends on"""
+        parts = [model, str(template_version), *sorted(paper_ids)]
+        return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+
+    def lookup(self, question: str, scope: str, generation: int) -> Optional[Dict]:
+        """Find the closest prior answer in the same scope if it is similar enough"""
+        try:
+            results = self.collection.query(
+                query_texts=[question],
+                n_results=1,
+                where={'$and': [{'scope': scope}, {'generation': generation}]},
+                include=['documents', 'metadatas', 'distances']
+            )
+        except Exception as e:
+            self.logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+        if results['ids'] and results['ids'][0]:
+            similarity = 1 - results['distances'][0][0]
+            if similarity >= self.similarity_threshold:
+                self.hits += 1
+                self.logger.info(f"Semantic cache hit (similarity {similarity:.3f})")
+                return {
+                    'question': results['documents'][0][0],
+                    'answer': results['metadatas'][0][0]['answer'],
+                    'similarity': similarity
+                }
+        self.misses += 1
+        return None
+
+    def store(self, question: str, answer: str, scope: str, generation: int) -> None:
+        """Remember an answer and drop entries from older collection generations"""
+        try:
+            self.collection.delete(where={'generation': {'$lt': generation}})
+            self.collection.add(
+                ids=[str(uuid.uuid4())],
+                documents=[question],
+                metadatas=[{'answer': answer, 'scope': scope, 'generation': generation, 'created_at': time.time()}]
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not store answer in semantic cache: {e}")
+
+    def stats(self) -> Dict:
+        """Hit-rate statistics; entries is None when Chroma cannot be reached"""
+        try:
+            entries = self.collection.count()
+        except Exception as e:
+            self.logger.warning(f"Could not count semantic cache entries: {e}")
+            entries = None
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,34 @@
+from config.settings import JOB_WORKERS
+from core.citation_manager import CitationManager
+from core.conversation_memory import ConversationMemory
+from core.conversation_store import ConversationStore
+from core.job_queue import JobQueue, start_job_workers
+from core.llm_handler import LLMHandler, start_model_warmer
+from core.paper_jobs import PROCESS_PAPER, PaperJobHandler
+from core.paper_processor import PaperProcessor
+from core.semantic_cache import SemanticCache
+from core.summary_store import SummaryStore
+from core.vector_store import VectorStore
+from utils.logger import get_logger
+
+
+class Services:
+    """Long-lived clients and stores shared by every session of the app process"""
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.logger.info("Initializing shared services")
+        self.llm_handler = LLMHandler()
+        start_model_warmer(self.llm_handler)
+        self.vector_store = VectorStore()
+        self.paper_processor = PaperProcessor()
+        self.citation_manager = CitationManager()
+        self.summary_store = SummaryStore()
+        self.semantic_cache = SemanticCache(self.vector_store.client)
+        self.conversation_store = ConversationStore()
+        self.conversation_memory = ConversationMemory(self.conversation_store, self.llm_handler)
+        self.job_queue = JobQueue()
+        self.paper_jobs = PaperJobHandler(self.paper_processor, self.vector_store, self.summary_store,
+                                          self.llm_handler)
+        # Uploads are processed here rather than in the script run, so they survive reruns and refreshes
+        self.job_workers = start_job_workers(self.job_queue, {PROCESS_PAPER: self.paper_jobs}, JOB_WORKERS)
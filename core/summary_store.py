@@ -0,0 +1,63 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import SUMMARIES_DIR
+from utils.logger import get_logger
+
+
+class SummaryStore:
+    """Generated paper summaries, stored as one JSON file per paper keyed by model"""
+
+    def __init__(self, summaries_dir: Path = SUMMARIES_DIR):
+        self.logger = get_logger(__name__)
+        self.summaries_dir = Path(summaries_dir)
+        os.makedirs(self.summaries_dir, exist_ok=True)
+
+    def _summary_file(self, paper_id: str) -> Path:
+        return self.summaries_dir / f"{paper_id}.json"
+
+    def _load(self, paper_id: str) -> Dict[str, Dict]:
+        summary_file = self._summary_file(paper_id)
+        if not summary_file.exists():
+            return {}
+        try:
+            with open(summary_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            self.logger.warning(f"Error loading summaries for {paper_id}: {e}")
+            return {}
+
+    def save(self, paper_id: str, summary: Dict) -> None:
+        """Store a summary under the model that generated it"""
+        summaries = self._load(paper_id)
+        summaries[summary['model']] = summary
+        try:
+            with open(self._summary_file(paper_id), 'w', encoding='utf-8') as f:
+                json.dump(summaries, f, indent=2)
+        except (IOError, OSError) as e:
+            self.logger.error(f"Error saving summary for {paper_id}: {e}")
+
+    def get(self, paper_id: str, model: Optional[str] = None) -> Optional[Dict]:
+        """Get the summary for a model, or the most recent summary from any model"""
+        summaries = self._load(paper_id)
+        if model is not None:
+            return summaries.get(model)
+        if not summaries:
+            return None
+        return max(summaries.values(), key=lambda s: s.get('generated_at', ''))
+
+    def get_many(self, paper_ids: List[str]) -> Dict[str, Dict]:
+        """Get the most recent summary for each paper that has one"""
+        summaries = {}
+        for paper_id in paper_ids:
+            summary = self.get(paper_id)
+            if summary is not None:
+                summaries[paper_id] = summary
+        return summaries
+
+    def delete(self, paper_id: str) -> None:
+        """Remove all summaries of a paper"""
+        summary_file = self._summary_file(paper_id)
+        if summary_file.exists():
+            os.remove(summary_file)
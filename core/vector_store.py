@@ -1,22 +1,292 @@
 import chromadb
 from chromadb.config import Settings
-from chromadb.errors import NotFoundError
-from typing import List, Dict
-from config.settings import CHROMA_HOST, CHROMA_PORT
+from chromadb.errors import ChromaError, NotFoundError
+import copy
+import json
+import os
+import time
+from typing import List, Dict, Iterator, Optional, Tuple
+from config.settings import (
+    DATA_DIR, CHROMA_MODE, CHROMA_HOST, CHROMA_PORT, CHROMA_DB_PATH,
+    CHROMA_BATCH_SIZE, CHROMA_BATCH_BYTES, CHROMA_MAX_RETRIES, CHROMA_INDEX_SYNC_SECONDS,
+    CHROMA_CHANGE_LOG_PAPERS, QUERY_CACHE_SIZE, QUERY_CACHE_TTL,
+    HYBRID_SEARCH, RRF_K, BM25_INDEX_PATH, PAPER_CATALOG_PATH
+)
+from core.bm25_index import BM25Index
+from core.chunker import chunk_id, stitch_chunks
+from core.event_log import PAPER_ADDED, PAPER_DELETED, get_event_log
+from core.paper_catalog import PaperCatalog
 from utils.logger import get_logger
+from utils.lru_cache import LRUCache
+
+# Chunks fetched per requested paper so that hits can be grouped by paper
+CHUNKS_PER_PAPER = 3
+
+# Errors caused by the submitted chunks themselves (bad metadata, duplicate IDs, ...). Only these
+# are worth bisecting a batch for; anything else is treated as Chroma being unavailable.
+ITEM_ERRORS = (ValueError, TypeError, ChromaError)
+
+
+def _reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> List[str]:
+    """Merge ranked ID lists by summing 1 / (k + rank) across lists"""
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
 
 
 class VectorStore:
     def __init__(self):
         self.logger = get_logger(__name__)
-        self.logger.info(f"Initializing VectorStore with Chroma at {CHROMA_HOST}:{CHROMA_PORT}")
-        self.client = chromadb.HttpClient(
-            host=CHROMA_HOST,
-            port=CHROMA_PORT,
-            settings=Settings(allow_reset=True)
-        )
+        self.client = self._create_client(CHROMA_MODE)
         self.collection_name = "research_papers"
         self.collection = self._get_or_create_collection()
+        self.last_write_stats = {}
+        self.event_log = get_event_log()
+        self.query_cache = LRUCache(max_size=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL or None)
+        self.generation_file = DATA_DIR / "collection_generation.json"
+        self._generation = 0
+        self._generation_mtime = None
+        self.catalog = PaperCatalog(PAPER_CATALOG_PATH)
+        self.keyword_index = BM25Index(BM25_INDEX_PATH) if HYBRID_SEARCH else None
+        # The keyword index and catalog are local SQLite files; with a shared Chroma server other hosts
+        # write to the collection too, so writes are logged on the collection and replayed locally
+        self.shared = CHROMA_MODE == "http"
+        self.revision_file = DATA_DIR / "local_index_revision.json"
+        self._last_sync = None
+        self.sync_local_indexes()
+        self.migration_file = DATA_DIR / "legacy_migration.json"
+        if not self.migration_file.exists():
+            self._migrate_legacy_documents()
+        if self.keyword_index is not None and self.keyword_index.doc_count() == 0:
+            self._backfill_keyword_index()
+        if self.catalog.count() == 0:
+            self._backfill_catalog()
+
+    def _migrate_legacy_documents(self, page_size: int = 1000) -> None:
+        """Give whole-paper documents stored before chunking a paper_id and chunk_index (runs once)"""
+        migrated_ids = []
+        offset = 0
+        try:
+            while True:
+                results = self.collection.get(offset=offset, limit=page_size, include=['metadatas'])
+                if not results['ids']:
+                    break
+                legacy = [
+                    (doc_id, {**(metadata or {}), 'paper_id': doc_id, 'chunk_index': 0})
+                    for doc_id, metadata in zip(results['ids'], results['metadatas'])
+                    if not metadata or 'paper_id' not in metadata or 'chunk_index' not in metadata
+                ]
+                if legacy:
+                    self.collection.update(
+                        ids=[doc_id for doc_id, _ in legacy],
+                        metadatas=[metadata for _, metadata in legacy]
+                    )
+                    self.catalog.upsert(legacy)
+                    migrated_ids.extend(doc_id for doc_id, _ in legacy)
+                offset += page_size
+        except Exception as e:
+            # Left unmarked so the migration is attempted again on the next start
+            self.logger.error(f"Error migrating legacy documents: {str(e)}", exc_info=True)
+            return
+
+        migrated = len(migrated_ids)
+        if migrated:
+            self.logger.info(f"Migrated {migrated} legacy documents to the chunked layout")
+            self._bump_generation()
+            self._publish_changes(added=migrated_ids)
+        try:
+            with open(self.migration_file, 'w', encoding='utf-8') as f:
+                json.dump({'migrated': migrated, 'migrated_at': time.time()}, f)
+        except OSError as e:
+            self.logger.warning(f"Could not record legacy migration: {e}")
+
+    def _backfill_keyword_index(self, page_size: int = 1000) -> None:
+        """Index chunks that were added before the keyword index existed (runs once)"""
+        offset = 0
+        while True:
+            results = self.collection.get(offset=offset, limit=page_size, include=['documents', 'metadatas'])
+            if not results['ids']:
+                break
+            if offset == 0:
+                self.logger.info("Building keyword index from existing collection")
+            self.keyword_index.add_chunks({
+                'id': chunk_id,
+                'content': results['documents'][i],
+                'metadata': results['metadatas'][i]
+            } for i, chunk_id in enumerate(results['ids']))
+            offset += page_size
+
+    def _backfill_catalog(self, page_size: int = 1000) -> None:
+        """Catalog papers that were added before the catalog existed (runs once)"""
+        offset = 0
+        while True:
+            papers = self.list_papers(offset=offset, limit=page_size)
+            if not papers:
+                break
+            if offset == 0:
+                self.logger.info("Building paper catalog from existing collection")
+            self.catalog.upsert((paper['id'], paper['metadata']) for paper in papers)
+            offset += page_size
+
+    @property
+    def generation(self) -> int:
+        """Collection generation, bumped on every write so cached results are never served stale"""
+        try:
+            mtime = os.stat(self.generation_file).st_mtime_ns
+        except FileNotFoundError:
+            return self._generation
+        # Re-read only when another writer (e.g. a bulk ingest) has touched the file
+        if mtime != self._generation_mtime:
+            try:
+                with open(self.generation_file, 'r', encoding='utf-8') as f:
+                    self._generation = json.load(f)['generation']
+                self._generation_mtime = mtime
+            except (json.JSONDecodeError, KeyError, IOError) as e:
+                self.logger.warning(f"Could not read collection generation: {e}")
+        return self._generation
+
+    def _bump_generation(self) -> None:
+        """Invalidate cached query results after a write"""
+        generation = self.generation + 1
+        try:
+            with open(self.generation_file, 'w', encoding='utf-8') as f:
+                json.dump({'generation': generation}, f)
+            self._generation_mtime = os.stat(self.generation_file).st_mtime_ns
+        except (IOError, OSError) as e:
+            self.logger.warning(f"Could not persist collection generation: {e}")
+        self._generation = generation
+
+    def _read_synced_revision(self) -> Optional[int]:
+        """Revision the local indexes reflect; re-read every time since other local processes update them too"""
+        try:
+            with open(self.revision_file, 'r', encoding='utf-8') as f:
+                return json.load(f)['revision']
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, KeyError, IOError) as e:
+            self.logger.warning(f"Could not read local index revision: {e}")
+            return None
+
+    def _record_synced_revision(self, revision: int) -> None:
+        try:
+            with open(self.revision_file, 'w', encoding='utf-8') as f:
+                json.dump({'revision': revision}, f)
+        except (IOError, OSError) as e:
+            self.logger.warning(f"Could not persist local index revision: {e}")
+
+    def _shared_changes(self) -> Tuple[Dict, int, List]:
+        """Collection metadata with its revision (0 before any logged write) and change log entries
+        of [revision, added_ids, removed_ids]"""
+        metadata = self.client.get_collection(self.collection_name).metadata or {}
+        revision = metadata.get('revision')
+        try:
+            changes = json.loads(metadata.get('changes', '[]'))
+        except (TypeError, json.JSONDecodeError):
+            changes = []
+        return metadata, revision if isinstance(revision, int) else 0, changes
+
+    def sync_local_indexes(self, force: bool = False) -> None:
+        """Bring the local keyword index and catalog up to date with writes made by other hosts"""
+        if not self.shared:
+            return
+        now = time.monotonic()
+        if not force and self._last_sync is not None and now - self._last_sync < CHROMA_INDEX_SYNC_SECONDS:
+            return
+        self._last_sync = now
+        try:
+            _, revision, changes = self._shared_changes()
+        except Exception as e:
+            self.logger.warning(f"Could not read collection revision: {str(e)}")
+            return
+        synced = self._read_synced_revision()
+        if revision == synced:
+            return
+
+        pending = [change for change in changes if isinstance(synced, int) and change[0] > synced]
+        if isinstance(synced, int) and synced < revision and pending and pending[0][0] == synced + 1:
+            self._apply_changes(pending)
+        else:
+            # New host, too far behind for the change log, or the collection was replaced: start over
+            self.logger.info("Local keyword index and catalog are out of date, rebuilding from the collection")
+            self.catalog.clear()
+            self._backfill_catalog()
+            if self.keyword_index is not None:
+                self.keyword_index.clear()
+                self._backfill_keyword_index()
+        self._record_synced_revision(revision)
+        self._bump_generation()
+
+    def _apply_changes(self, changes: List) -> None:
+        """Replay other hosts' paper additions and removals on the local indexes"""
+        latest = {}
+        for _, added, removed in changes:
+            latest.update((paper_id, False) for paper_id in removed)
+            latest.update((paper_id, True) for paper_id in added)
+        added = [paper_id for paper_id, present in latest.items() if present]
+        self.logger.info(f"Applying {len(latest)} paper changes made by other hosts to the local indexes")
+
+        for paper_id in latest:
+            self.catalog.remove(paper_id)
+            if self.keyword_index is not None:
+                self.keyword_index.remove_paper(paper_id)
+        for start in range(0, len(added), CHROMA_BATCH_SIZE):
+            results = self.collection.get(
+                where={'paper_id': {'$in': added[start:start + CHROMA_BATCH_SIZE]}},
+                include=['documents', 'metadatas']
+            )
+            chunks = [{
+                'id': chunk_id,
+                'content': results['documents'][i],
+                'metadata': results['metadatas'][i]
+            } for i, chunk_id in enumerate(results['ids'])]
+            if self.keyword_index is not None:
+                self.keyword_index.add_chunks(chunks)
+            self.catalog.upsert(
+                (chunk['metadata']['paper_id'], chunk['metadata'])
+                for chunk in chunks if chunk['metadata'].get('chunk_index') == 0
+            )
+
+    def _publish_changes(self, added: List[str] = (), removed: List[str] = ()) -> None:
+        """Append this host's paper additions and removals to the shared collection's change log"""
+        if not self.shared or not (added or removed):
+            return
+        # Pick up other hosts' writes first, or they would be hidden behind this revision
+        self.sync_local_indexes(force=True)
+        try:
+            metadata, revision, changes = self._shared_changes()
+            revision += 1
+            changes.append([revision, list(added), list(removed)])
+            # Keep the log bounded; hosts that fall further behind rebuild instead
+            while len(changes) > 1 and sum(len(a) + len(r) for _, a, r in changes) > CHROMA_CHANGE_LOG_PAPERS:
+                changes.pop(0)
+            self.collection.modify(metadata={**metadata, 'revision': revision, 'changes': json.dumps(changes)})
+        except Exception as e:
+            self.logger.warning(f"Could not publish collection changes: {str(e)}")
+            return
+        self._record_synced_revision(revision)
+
+    def cache_stats(self) -> Dict:
+        """Query cache hit/miss counters"""
+        return {**self.query_cache.stats(), 'generation': self.generation}
+
+    def _create_client(self, mode: str):
+        """Create an HTTP client for a shared Chroma server or an in-process persistent client"""
+        if mode == "persistent":
+            self.logger.info(f"Initializing VectorStore with embedded Chroma at {CHROMA_DB_PATH}")
+            return chromadb.PersistentClient(
+                path=CHROMA_DB_PATH,
+                settings=Settings(allow_reset=True, anonymized_telemetry=False)
+            )
+        if mode == "http":
+            self.logger.info(f"Initializing VectorStore with Chroma at {CHROMA_HOST}:{CHROMA_PORT}")
+            return chromadb.HttpClient(
+                host=CHROMA_HOST,
+                port=CHROMA_PORT,
+                settings=Settings(allow_reset=True)
+            )
+        raise ValueError(f"Unsupported Chroma mode: {mode}")
 
     def _get_or_create_collection(self):
         """Get or create the research papers collection"""
@@ -34,68 +304,285 @@ class VectorStore:
                 self.logger.error(f"Unexpected error getting collection: {str(e)}", exc_info=True)
                 raise
 
-    def add_paper(self, paper_id: str, content: str, metadata: Dict) -> bool:
-        """Add a paper to the vector store"""
-        self.logger.info(f"Adding paper with ID: {paper_id}")
+    def add_paper(self, paper_id: str, chunks: List[Dict]) -> bool:
+        """Add a chunked paper to the vector store"""
+        self.logger.info(f"Adding paper with ID: {paper_id} ({len(chunks)} chunks)")
+        return self.add_papers([{'id': paper_id, 'chunks': chunks}])[paper_id]
+
+    def add_papers(self, papers: List[Dict]) -> Dict[str, bool]:
+        """Add several chunked papers in bounded batches, returning success per paper ID"""
+        self.logger.info(f"Adding {len(papers)} papers")
+        chunks = [chunk for paper in papers for chunk in paper['chunks']]
+        existing_ids = self._existing_ids([chunk['id'] for chunk in chunks])
+        stats = self.add_chunks(chunks)
+
+        failed_ids = set(stats['failed_ids'])
+        outcome = {}
+        for paper in papers:
+            chunk_ids = [chunk['id'] for chunk in paper['chunks']]
+            outcome[paper['id']] = not failed_ids.intersection(chunk_ids)
+            if not outcome[paper['id']]:
+                if existing_ids is None:
+                    self.logger.warning(f"Not cleaning up partial paper {paper['id']}: prior state unknown")
+                    continue
+                # Don't leave a partially indexed paper behind, but keep chunks that were there before this call
+                inserted_ids = [chunk_id for chunk_id in chunk_ids
+                                if chunk_id not in failed_ids and chunk_id not in existing_ids]
+                if not inserted_ids:
+                    continue
+                try:
+                    self.collection.delete(ids=inserted_ids)
+                    if self.keyword_index is not None:
+                        self.keyword_index.remove_chunks(inserted_ids)
+                except Exception as e:
+                    self.logger.warning(f"Could not clean up partial paper {paper['id']}: {str(e)}")
+            else:
+                if paper['chunks']:
+                    self.catalog.upsert([(paper['id'], paper['chunks'][0]['metadata'])])
+                self.event_log.record(PAPER_ADDED, paper['id'], stats['seconds'] / len(papers),
+                                      chunks=len(paper['chunks']))
+        self._publish_changes(added=[paper_id for paper_id, added in outcome.items() if added])
+        return outcome
+
+    def _existing_ids(self, chunk_ids: List[str]) -> Optional[set]:
+        """IDs among chunk_ids that are already stored, or None if Chroma can't be asked"""
+        existing = set()
         try:
-            self.collection.add(
-                documents=[content],
-                ids=[paper_id],
-                metadatas=[metadata]
-            )
-            self.logger.info(f"Successfully added paper: {paper_id}")
-            return True
+            for start in range(0, len(chunk_ids), CHROMA_BATCH_SIZE):
+                existing.update(self.collection.get(ids=chunk_ids[start:start + CHROMA_BATCH_SIZE], include=[])['ids'])
         except Exception as e:
-            self.logger.error(f"Error adding paper: {str(e)}", exc_info=True)
+            self.logger.warning(f"Could not check for existing chunks: {str(e)}")
+            return None
+        return existing
+
+    def has_paper(self, paper_id: str) -> bool:
+        """Whether the collection currently holds a paper (chunked, or a legacy single document)"""
+        try:
+            return bool(self.collection.get(ids=[chunk_id(paper_id, 0), paper_id], include=[])['ids'])
+        except Exception as e:
+            self.logger.warning(f"Could not check for paper {paper_id}: {str(e)}")
             return False
 
-    def search_papers(self, query: str, n_results: int = 5) -> List[Dict]:
-        """Search for relevant papers based on query"""
+    def add_chunks(self, chunks: List[Dict]) -> Dict:
+        """Write chunks in count- and size-bounded batches with retries, returning throughput stats"""
+        started = time.perf_counter()
+        stats = {'added': 0, 'failed_ids': [], 'batches': 0}
+
+        for batch in self._batches(chunks):
+            self._add_batch(batch, stats)
+
+        self._bump_generation()
+        stats['seconds'] = time.perf_counter() - started
+        stats['chunks_per_second'] = stats['added'] / stats['seconds'] if stats['seconds'] else 0.0
+        self.last_write_stats = stats
+        self.logger.info(
+            f"Added {stats['added']}/{len(chunks)} chunks in {stats['batches']} batches "
+            f"({stats['seconds']:.2f}s, {stats['chunks_per_second']:.1f} chunks/s)"
+        )
+        return stats
+
+    def _batches(self, chunks: List[Dict]) -> Iterator[List[Dict]]:
+        """Split chunks into batches bounded by count and total content size"""
+        max_count = CHROMA_BATCH_SIZE
+        server_limit = getattr(self.client, 'max_batch_size', None)
+        if isinstance(server_limit, int) and server_limit > 0:
+            max_count = min(max_count, server_limit)
+
+        batch, batch_bytes = [], 0
+        for chunk in chunks:
+            chunk_bytes = len(chunk['content'].encode('utf-8'))
+            if batch and (len(batch) >= max_count or batch_bytes + chunk_bytes > CHROMA_BATCH_BYTES):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(chunk)
+            batch_bytes += chunk_bytes
+        if batch:
+            yield batch
+
+    def _add_batch(self, batch: List[Dict], stats: Dict) -> None:
+        """Add one batch, retrying transport errors with backoff and splitting it to isolate bad chunks"""
+        if stats.get('unavailable'):
+            stats['failed_ids'].extend(chunk['id'] for chunk in batch)
+            return
+
+        for attempt in range(CHROMA_MAX_RETRIES):
+            try:
+                stats['batches'] += 1
+                self.collection.add(
+                    documents=[chunk['content'] for chunk in batch],
+                    ids=[chunk['id'] for chunk in batch],
+                    metadatas=[chunk['metadata'] for chunk in batch]
+                )
+                stats['added'] += len(batch)
+                if self.keyword_index is not None:
+                    self.keyword_index.add_chunks(batch)
+                return
+            except ITEM_ERRORS as e:
+                # The input itself is rejected; retrying the same batch won't help, splitting will
+                self.logger.warning(f"Batch of {len(batch)} chunks rejected: {str(e)}")
+                break
+            except Exception as e:
+                self.logger.warning(
+                    f"Batch of {len(batch)} chunks failed (attempt {attempt + 1}/{CHROMA_MAX_RETRIES}): {str(e)}"
+                )
+                if attempt + 1 < CHROMA_MAX_RETRIES:
+                    time.sleep(0.5 * 2 ** attempt)
+        else:
+            # Chroma is unreachable: fail this batch and every remaining one without further calls
+            self.logger.error(f"Chroma unavailable, failing batch of {len(batch)} chunks and any remaining batches")
+            stats['unavailable'] = True
+            stats['failed_ids'].extend(chunk['id'] for chunk in batch)
+            return
+
+        if len(batch) == 1:
+            self.logger.error(f"Giving up on chunk {batch[0]['id']}")
+            stats['failed_ids'].append(batch[0]['id'])
+            return
+
+        middle = len(batch) // 2
+        self._add_batch(batch[:middle], stats)
+        self._add_batch(batch[middle:], stats)
+
+    def search_papers(self, query: str, n_results: int = 5, where: Optional[Dict] = None) -> List[Dict]:
+        """Search for relevant chunks and group the hits by paper"""
+        self.sync_local_indexes()
+        cache_key = (
+            " ".join(query.lower().split()),
+            n_results,
+            json.dumps(where, sort_keys=True),
+            self.generation
+        )
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            self.logger.info(f"Query cache hit for: {query[:50]}...")
+            return copy.deepcopy(cached)
+
         self.logger.info(f"Searching papers with query: {query[:50]}... (n_results={n_results})")
         try:
+            n_chunks = n_results * CHUNKS_PER_PAPER
             results = self.collection.query(
                 query_texts=[query],
-                n_results=n_results
+                n_results=n_chunks,
+                where=where
             )
 
-            papers = []
+            chunks = {}
             for i, doc in enumerate(results['documents'][0]):
-                papers.append({
-                    'id': results['ids'][0][i],
-                    'content': doc,
-                    'metadata': results['metadatas'][0][i],
-                    'distance': results['distances'][0][i]
-                })
-
-            self.logger.info(f"Found {len(papers)} relevant papers")
-            return papers
+                chunks[results['ids'][0][i]] = self._hit(
+                    results['ids'][0][i], doc, results['metadatas'][0][i], results['distances'][0][i]
+                )
+            ranked = list(chunks)
+
+            # Keyword search can't apply metadata filters, so filtered searches stay vector-only
+            if self.keyword_index is not None and where is None:
+                keyword_ranked = [chunk_id for chunk_id, _ in self.keyword_index.search(query, n_chunks)]
+                missing = [chunk_id for chunk_id in keyword_ranked if chunk_id not in chunks]
+                if missing:
+                    fetched = self.collection.get(ids=missing, include=['documents', 'metadatas'])
+                    for i, doc in enumerate(fetched['documents']):
+                        chunks[fetched['ids'][i]] = self._hit(fetched['ids'][i], doc, fetched['metadatas'][i], None)
+                ranked = _reciprocal_rank_fusion([ranked, keyword_ranked])
+
+            papers = {}
+            for rank, chunk_id in enumerate(ranked):
+                if chunk_id not in chunks:
+                    continue
+                chunk = chunks[chunk_id]
+                chunk['rank'] = rank
+                paper_id = chunk.pop('paper_id')
+                metadata = chunk.pop('metadata')
+                if paper_id not in papers:
+                    papers[paper_id] = {
+                        'id': paper_id,
+                        'metadata': metadata,
+                        'distance': None,
+                        'chunks': []
+                    }
+                papers[paper_id]['chunks'].append(chunk)
+
+            grouped = list(papers.values())[:n_results]
+            for paper in grouped:
+                paper['content'] = "\n...\n".join(chunk['content'] for chunk in paper['chunks'])
+                distances = [chunk['distance'] for chunk in paper['chunks'] if chunk['distance'] is not None]
+                paper['distance'] = min(distances) if distances else None
+
+            self.logger.info(f"Found {len(grouped)} relevant papers")
+            self.query_cache.put(cache_key, copy.deepcopy(grouped))
+            return grouped
         except Exception as e:
             self.logger.error(f"Error searching papers: {str(e)}", exc_info=True)
             return []
 
-    def get_all_papers(self) -> List[Dict]:
-        """Get all papers in the collection"""
-        self.logger.info("Getting all papers from collection")
-        try:
-            results = self.collection.get()
-            papers = []
-            for i, doc in enumerate(results['documents']):
-                papers.append({
-                    'id': results['ids'][i],
-                    'content': doc,
-                    'metadata': results['metadatas'][i]
-                })
-            self.logger.info(f"Retrieved {len(papers)} papers from collection")
+    @staticmethod
+    def _hit(chunk_id: str, doc: str, metadata: Dict, distance: Optional[float]) -> Dict:
+        """Build a chunk search hit; distance is None for keyword-only matches"""
+        return {
+            'id': chunk_id,
+            'paper_id': metadata.get('paper_id', chunk_id),
+            'metadata': metadata,
+            'content': doc,
+            'section': metadata.get('section', ''),
+            'start_char': metadata.get('start_char', 0),
+            'end_char': metadata.get('end_char', len(doc)),
+            'distance': distance
+        }
+
+    def count(self) -> int:
+        """Count papers from the catalog without touching Chroma"""
+        self.sync_local_indexes()
+        try:
+            return self.catalog.count()
+        except Exception as e:
+            self.logger.error(f"Error counting papers: {str(e)}", exc_info=True)
+            return 0
+
+    def list_papers(self, offset: int = 0, limit: int = 20, include_content: bool = False) -> List[Dict]:
+        """List a page of papers using only their first chunk's metadata"""
+        self.logger.info(f"Listing papers (offset={offset}, limit={limit})")
+        try:
+            results = self.collection.get(
+                where={'chunk_index': 0},
+                offset=offset,
+                limit=limit,
+                include=['metadatas']
+            )
+            papers = [{
+                'id': metadata.get('paper_id', results['ids'][i]),
+                'metadata': metadata
+            } for i, metadata in enumerate(results['metadatas'])]
+
+            if include_content:
+                for paper in papers:
+                    paper['content'] = self.get_paper_content(paper['id'])
             return papers
         except Exception as e:
-            self.logger.error(f"Error getting papers: {str(e)}", exc_info=True)
+            self.logger.error(f"Error listing papers: {str(e)}", exc_info=True)
             return []
 
+    def get_paper_content(self, paper_id: str) -> str:
+        """Fetch and reassemble the full text of a single paper"""
+        self.logger.info(f"Fetching content for paper: {paper_id}")
+        try:
+            results = self.collection.get(where={'paper_id': paper_id}, include=['documents', 'metadatas'])
+            return stitch_chunks([{
+                'content': doc,
+                'metadata': results['metadatas'][i]
+            } for i, doc in enumerate(results['documents'])])
+        except Exception as e:
+            self.logger.error(f"Error fetching paper content: {str(e)}", exc_info=True)
+            return ""
+
     def delete_paper(self, paper_id: str) -> bool:
-        """Delete a paper from the collection"""
+        """Delete a paper and all of its chunks from the collection"""
         self.logger.info(f"Deleting paper with ID: {paper_id}")
         try:
-            self.collection.delete(ids=[paper_id])
+            self.collection.delete(where={'paper_id': paper_id})
+            if self.keyword_index is not None:
+                self.keyword_index.remove_paper(paper_id)
+            self.catalog.remove(paper_id)
+            self._bump_generation()
+            self._publish_changes(removed=[paper_id])
+            self.event_log.record(PAPER_DELETED, paper_id)
             self.logger.info(f"Successfully deleted paper: {paper_id}")
             return True
         except Exception as e:
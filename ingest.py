@@ -0,0 +1,54 @@
+import argparse
+import sys
+from pathlib import Path
+
+from core.bulk_ingest import BulkIngestor, IngestManifest
+from core.paper_processor import PaperProcessor
+from core.vector_store import VectorStore
+from config.settings import INGEST_MANIFEST_PATH
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Ingest a directory tree of PDF/TXT papers into the research assistant. "
+                    "Progress is kept in a manifest, so an interrupted run resumes where it stopped."
+    )
+    parser.add_argument("directory", type=Path, help="Directory to scan for papers")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Files processed at the same time (one extraction process each)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Chunks per vector store write")
+    parser.add_argument("--manifest", type=Path, default=INGEST_MANIFEST_PATH, help="Manifest database path")
+    parser.add_argument("--retry-failed", action="store_true", help="Retry files that failed previously")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.directory.is_dir():
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 1
+
+    manifest = IngestManifest(args.manifest)
+    ingestor = BulkIngestor(
+        # One extraction process per concurrent file; the ingest threads only do I/O and writes
+        PaperProcessor(max_workers=args.concurrency, extract_in_pool=True),
+        VectorStore(),
+        manifest,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size
+    )
+
+    try:
+        counts = ingestor.run(args.directory, retry_failed=args.retry_failed)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume.", file=sys.stderr)
+        return 130
+    finally:
+        manifest.close()
+
+    print(", ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
+    return 1 if counts.get('failed') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app runs from the repository root, so tests import core/, utils/ and config/ from there too
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
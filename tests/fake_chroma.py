@@ -0,0 +1,79 @@
+"""In-memory stand-in for the parts of the Chroma client API that VectorStore uses"""
+
+
+def _matches(metadata, where):
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == '$and':
+            if not all(_matches(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict) and '$in' in condition:
+            if metadata.get(key) not in condition['$in']:
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class FakeCollection:
+    def __init__(self, name, metadata=None):
+        self.name = name
+        self.metadata = dict(metadata or {})
+        self.records = {}
+        self.calls = []
+        # Set by tests: IDs whose metadata the server rejects, or a server that can't be reached at all
+        self.rejected_ids = set()
+        self.unreachable = False
+
+    def add(self, ids, documents, metadatas):
+        self.calls.append(('add', list(ids)))
+        if self.unreachable:
+            raise ConnectionError("Could not connect to a Chroma server")
+        if self.rejected_ids.intersection(ids):
+            raise ValueError("Expected metadata value to be a str, int, float or bool")
+        if len(set(ids)) != len(ids):
+            raise ValueError("Expected IDs to be unique")
+        for record_id, document, metadata in zip(ids, documents, metadatas):
+            # Like Chroma, adding an existing ID leaves the stored record alone
+            self.records.setdefault(record_id, (document, dict(metadata)))
+
+    def get(self, ids=None, where=None, offset=0, limit=None, include=()):
+        self.calls.append(('get', where))
+        selected = [
+            (record_id, record) for record_id, record in self.records.items()
+            if (ids is None or record_id in ids) and _matches(record[1], where)
+        ]
+        selected = selected[offset:offset + limit if limit is not None else None]
+        return {
+            'ids': [record_id for record_id, _ in selected],
+            'documents': [document for _, (document, _) in selected],
+            'metadatas': [metadata for _, (_, metadata) in selected],
+        }
+
+    def update(self, ids, metadatas):
+        for record_id, metadata in zip(ids, metadatas):
+            self.records[record_id] = (self.records[record_id][0], dict(metadata))
+
+    def delete(self, ids=None, where=None):
+        self.calls.append(('delete', ids if ids is not None else where))
+        for record_id in [record_id for record_id, (_, metadata) in self.records.items()
+                          if (ids is None or record_id in ids) and _matches(metadata, where)]:
+            del self.records[record_id]
+
+    def modify(self, metadata):
+        self.metadata = dict(metadata)
+
+
+class FakeClient:
+    def __init__(self):
+        self.collections = {}
+
+    def get_collection(self, name):
+        if name not in self.collections:
+            raise ValueError(f"Collection {name} does not exist")
+        return self.collections[name]
+
+    def create_collection(self, name, metadata=None):
+        self.collections[name] = FakeCollection(name, metadata)
+        return self.collections[name]
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from core.llm_handler import LLMHandler
+from core.llm_metrics import LLMMetrics
+from core.response_cache import ResponseCache
+from utils.logger import get_logger
+
+
+def _parts(answer):
+    words = answer.split()
+    return ([{'message': {'content': word + " "}} for word in words[:-1]]
+            + [{'message': {'content': words[-1]}, 'done': True}])
+
+
+class FakeClient:
+    """Stands in for ollama.Client, streaming a fixed answer word by word"""
+
+    def __init__(self, answer="Attention is all you need"):
+        self.answer = answer
+        self.calls = 0
+
+    def chat(self, model, messages, stream, options, keep_alive):
+        self.calls += 1
+        if not stream:
+            return {'message': {'content': self.answer}, 'done': True}
+        return iter(_parts(self.answer))
+
+
+class FakeAsyncClient:
+    """Stands in for ollama.AsyncClient; `delay` seconds pass before each streamed part"""
+
+    def __init__(self, answer="Attention is all you need", delay=0.0):
+        self.answer = answer
+        self.delay = delay
+        self.calls = 0
+        self.closed = 0
+
+    def __call__(self):
+        # Used as the client factory, handing out this one client every time
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed += 1
+
+    async def chat(self, model, messages, stream, options, keep_alive):
+        self.calls += 1
+        if not stream:
+            await asyncio.sleep(self.delay)
+            return {'message': {'content': self.answer}, 'done': True}
+
+        async def parts():
+            for part in _parts(self.answer):
+                await asyncio.sleep(self.delay)
+                yield part
+        return parts()
+
+
+def make_llm_handler(tmp_path, slots=1):
+    """LLMHandler with a fake client, built without __init__ so nothing under data/ is created"""
+    handler = LLMHandler.__new__(LLMHandler)
+    handler.logger = get_logger(__name__)
+    handler.client = FakeClient()
+    handler.routes = {'chat': {'model': "test-model", 'options': {}}}
+    handler.model_name = "test-model"
+    handler.response_cache = ResponseCache(tmp_path / "cache.db")
+    handler.metrics = LLMMetrics(tmp_path / "metrics.db")
+    handler._route_stats = {'chat': {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}}
+    handler._stats_lock = threading.Lock()
+    handler._slots = threading.BoundedSemaphore(slots)
+    return handler
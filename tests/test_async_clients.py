@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+import pytest
+from core.async_clients import AsyncLLMHandler, AsyncVectorStore, recall_and_retrieve
+from core.llm_handler import ERROR_PREFIX
+from fake_ollama import FakeAsyncClient, make_llm_handler
+
+
+@pytest.fixture
+def llm(tmp_path):
+    return make_llm_handler(tmp_path)
+
+
+def make_async(llm, **kwargs):
+    client = FakeAsyncClient(delay=kwargs.pop('delay', 0.0))
+    return AsyncLLMHandler(llm, client_factory=client, **kwargs), client
+
+
+async def collect(stream):
+    return "".join([piece async for piece in stream])
+
+
+def slot_free(llm):
+    if not llm._slots.acquire(blocking=False):
+        return False
+    llm._slots.release()
+    return True
+
+
+def test_async_and_sync_calls_share_the_response_cache(llm):
+    async_llm, client = make_async(llm)
+    assert "".join(llm.stream_response("What is attention?")) == "Attention is all you need"
+    assert asyncio.run(collect(async_llm.stream_response("What is attention?"))) == "Attention is all you need"
+    assert client.calls == 0
+
+    assert asyncio.run(async_llm.generate_response("Define a transformer")) == "Attention is all you need"
+    assert llm.generate_response("Define a transformer") == "Attention is all you need"
+    assert client.calls == 1 and llm.client.calls == 1
+
+
+def test_async_stream_holds_a_request_slot_until_it_ends(llm):
+    async_llm, client = make_async(llm)
+
+    async def consume():
+        stream = async_llm.stream_response("What is attention?")
+        first = await stream.__anext__()
+        held = not slot_free(llm)
+        rest = await collect(stream)
+        return first, held, rest
+
+    assert asyncio.run(consume()) == ("Attention ", True, "is all you need")
+    assert slot_free(llm) and client.closed == 1
+
+
+def test_cancelling_a_stream_releases_its_slot(llm):
+    async_llm, client = make_async(llm, delay=0.05)
+
+    async def cancel_midway():
+        task = asyncio.create_task(collect(async_llm.stream_response("What is attention?")))
+        await asyncio.sleep(0.08)
+        assert not slot_free(llm)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+    assert slot_free(llm) and client.closed == 1
+    # A cancelled stream is not cached as a complete answer
+    assert llm.response_cache.get(llm._cache_key(llm._build_prompt("What is attention?"), llm.route("chat"))) is None
+
+
+def test_slow_stream_times_out_and_frees_its_slot(llm):
+    async_llm, _ = make_async(llm, delay=0.05, timeout=0.12)
+    response = asyncio.run(collect(async_llm.stream_response("What is attention?")))
+    assert response.startswith("Attention ") and ERROR_PREFIX in response
+    assert slot_free(llm)
+
+
+def test_waiting_for_a_slot_counts_towards_the_timeout(llm):
+    async_llm, client = make_async(llm, timeout=0.1)
+    llm._slots.acquire()
+    try:
+        response = asyncio.run(async_llm.generate_response("What is attention?"))
+    finally:
+        llm._slots.release()
+    assert response.startswith(ERROR_PREFIX)
+    assert client.calls == 0 and slot_free(llm)
+
+
+class SlowStore:
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.searching = threading.Event()
+
+    def search_papers(self, query, n_results=5, where=None):
+        self.searching.set()
+        time.sleep(self.seconds)
+        return [{'id': "paper-1", 'query': query}]
+
+
+class RecallingMemory:
+    """Conversation memory whose history only returns once a search has started alongside it"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def history(self, conversation_id):
+        return "overlapped" if self.store.searching.wait(timeout=2) else "sequential"
+
+
+def test_retrieval_runs_alongside_history_recall():
+    store = SlowStore()
+    history, papers = asyncio.run(recall_and_retrieve(
+        RecallingMemory(store), AsyncVectorStore(store), "conversation-1", "What is attention?"
+    ))
+    assert history == "overlapped"
+    assert papers == [{'id': "paper-1", 'query': "What is attention?"}]
+
+
+def test_new_conversations_and_rag_off_skip_their_step():
+    store = SlowStore()
+    assert asyncio.run(recall_and_retrieve(
+        RecallingMemory(store), AsyncVectorStore(store), None, "What is attention?", use_rag=False
+    )) == ("", [])
+    assert not store.searching.is_set()
+
+
+def test_search_timeout_is_raised():
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(AsyncVectorStore(SlowStore(seconds=0.5), timeout=0.05).search_papers("What is attention?"))
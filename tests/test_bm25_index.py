@@ -0,0 +1,59 @@
+from core.bm25_index import BM25Index, tokenize
+
+
+def _chunk(chunk_id, paper_id, content):
+    return {'id': chunk_id, 'content': content, 'metadata': {'paper_id': paper_id}}
+
+
+def _index(tmp_path):
+    index = BM25Index(tmp_path / "bm25.db")
+    index.add_chunks([
+        _chunk("p1_chunk_0000", "p1", "Transformers use attention for sequence modelling"),
+        _chunk("p1_chunk_0001", "p1", "We evaluate on ImageNet-1k and report top-1 accuracy"),
+        _chunk("p2_chunk_0000", "p2", "Convolutional networks for image classification"),
+    ])
+    return index
+
+
+def _stats(index):
+    with index._lock:
+        return index._stats()
+
+
+def test_tokenize_keeps_compound_terms_and_parts():
+    assert tokenize("The GPT-4 model") == ["gpt-4", "gpt", "4", "model"]
+
+
+def test_search_ranks_matching_chunks(tmp_path):
+    index = _index(tmp_path)
+    results = index.search("attention transformers")
+    assert results[0][0] == "p1_chunk_0000"
+    assert index.search("imagenet-1k")[0][0] == "p1_chunk_0001"
+    assert index.search("the and") == []
+
+
+def test_adding_a_chunk_twice_does_not_change_stats(tmp_path):
+    index = _index(tmp_path)
+    before = _stats(index)
+    index.add_chunks([_chunk("p2_chunk_0000", "p2", "Convolutional networks for image classification")])
+    assert _stats(index) == before
+
+
+def test_remove_keeps_stats_consistent(tmp_path):
+    index = _index(tmp_path)
+    index.remove_paper("p1")
+    assert index.doc_count() == 1
+    assert _stats(index)[1] == len(tokenize("Convolutional networks for image classification"))
+    assert index.search("attention") == []
+
+    index.remove_chunks(["p2_chunk_0000", "missing"])
+    assert _stats(index) == (0, 0)
+    with index._lock:
+        assert index.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0] == 0
+
+
+def test_clear_empties_the_index(tmp_path):
+    index = _index(tmp_path)
+    index.clear()
+    assert _stats(index) == (0, 0)
+    assert index.search("attention") == []
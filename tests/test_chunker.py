@@ -0,0 +1,47 @@
+import pytest
+from core.chunker import FRONT_MATTER, TextChunker, chunk_id, stitch_chunks
+from utils.token_utils import TokenUtils
+
+
+def test_chunk_id_is_zero_padded():
+    assert chunk_id("paper", 7) == "paper_chunk_0007"
+
+
+def test_overlap_must_be_smaller_than_chunk_size():
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=50, chunk_overlap=50)
+
+
+def test_split_sections_detects_headings():
+    text = "A Study of Things\nJ. Doe\nAbstract\nWe study things.\n1. Introduction\nThings matter.\nReferences\n[1] X"
+    sections = [section for section, _, _ in TextChunker().split_sections(text)]
+    assert sections == [FRONT_MATTER, 'abstract', 'introduction', 'references']
+
+
+def test_chunks_are_token_bounded_and_overlap():
+    text = " ".join(f"word{i}" for i in range(250))
+    chunks = TextChunker(chunk_size=100, chunk_overlap=20).chunk_text(text)
+    assert len(chunks) == 3
+    assert all(TokenUtils.count_tokens(chunk['content']) <= 100 for chunk in chunks)
+    assert chunks[1]['start_char'] < chunks[0]['end_char']
+    assert chunks[-1]['end_char'] == len(text)
+
+
+def test_stitch_chunks_restores_text():
+    text = " ".join(f"word{i}" for i in range(250))
+    records = TextChunker(chunk_size=100, chunk_overlap=20).chunk_paper("p1", text, {'title': "T"})
+    assert stitch_chunks(list(reversed(records))) == text
+
+
+def test_chunk_paper_metadata():
+    records = TextChunker(chunk_size=100, chunk_overlap=20).chunk_paper("p1", "Abstract\nShort paper.", {'title': "T"})
+    assert [record['id'] for record in records] == [chunk_id("p1", i) for i in range(len(records))]
+    assert records[0]['metadata']['paper_id'] == "p1"
+    assert records[0]['metadata']['chunk_index'] == 0
+    assert records[0]['metadata']['title'] == "T"
+    assert records[0]['metadata']['section'] == 'abstract'
+
+
+def test_empty_text_yields_one_chunk():
+    chunks = TextChunker().chunk_text("")
+    assert len(chunks) == 1 and chunks[0]['section'] == FRONT_MATTER
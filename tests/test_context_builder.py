@@ -0,0 +1,54 @@
+from core.context_builder import ContextBuilder
+from utils.token_utils import TokenUtils
+
+
+def _words(start, count):
+    return " ".join(f"w{i}" for i in range(start, start + count))
+
+
+def _chunk(rank, start_word, count, section='methods'):
+    # Each "wN" word is one token; offsets are computed as if words were stored back to back
+    content = _words(start_word, count)
+    start_char = len(_words(0, start_word)) + 1 if start_word else 0
+    return {'content': content, 'section': section, 'rank': rank,
+            'start_char': start_char, 'end_char': start_char + len(content)}
+
+
+def _paper(paper_id, chunks):
+    return {'id': paper_id, 'metadata': {'title': paper_id.upper()}, 'chunks': chunks}
+
+
+def test_context_stays_within_budget():
+    papers = [_paper("p1", [_chunk(0, 0, 100), _chunk(2, 200, 100)]), _paper("p2", [_chunk(1, 0, 100)])]
+    context, stats = ContextBuilder(token_budget=150).build(papers)
+    assert stats['used_tokens'] <= 150
+    assert stats['chunks_used'] == 2
+    assert stats['chunks_dropped'] == 1
+    assert "Paper: P1" in context and "Paper: P2" in context
+
+
+def test_overlapping_chunks_are_trimmed_or_skipped():
+    papers = [_paper("p1", [_chunk(0, 0, 100), _chunk(1, 80, 100), _chunk(2, 10, 80)])]
+    context, stats = ContextBuilder(token_budget=1000).build(papers)
+    assert stats['duplicates_skipped'] == 1
+    assert stats['chunks_used'] == 2
+    # Words shared by the first two chunks appear once
+    assert context.count("w85 ") == 1
+    assert stats['used_tokens'] == 180
+
+
+def test_summary_is_capped_and_goes_first():
+    papers = [_paper("p1", [_chunk(0, 0, 100)])]
+    summaries = {"p1": {'summary': _words(1000, 500)}}
+    context, stats = ContextBuilder(token_budget=400).build(papers, summaries)
+    summary_line = context.splitlines()[1]
+    assert summary_line.startswith("Summary: ")
+    assert TokenUtils.count_tokens(summary_line[len("Summary: "):]) == 200
+    assert stats['chunks_used'] == 1
+    assert stats['used_tokens'] == 300
+
+
+def test_sections_follow_paper_order():
+    papers = [_paper("p1", [_chunk(1, 0, 50)]), _paper("p2", [_chunk(0, 0, 50)])]
+    context, _ = ContextBuilder(token_budget=1000).build(papers)
+    assert context.index("Paper: P1") < context.index("Paper: P2")
@@ -0,0 +1,100 @@
+from core.conversation_memory import ConversationMemory
+from core.conversation_store import ConversationStore
+from core.llm_handler import ERROR_PREFIX
+from utils.token_utils import TokenUtils
+
+
+class FakeLLM:
+    """Stands in for LLMHandler.summarize_conversation"""
+
+    def __init__(self, summary="The user asked about transformers and attention.", fail=False):
+        self.summary = summary
+        self.fail = fail
+        self.calls = 0
+
+    def summarize_conversation(self, previous_summary, turns, max_tokens):
+        self.calls += 1
+        return f"{ERROR_PREFIX}: model offline" if self.fail else self.summary
+
+
+def _conversation(store, turns=10):
+    conversation_id = store.create("Transformers")
+    for i in range(turns):
+        store.append(conversation_id, {'role': 'user', 'content': f"Question {i} about attention heads?"})
+        store.append(conversation_id, {'role': 'assistant', 'content': f"Answer {i} citing two papers."})
+    return conversation_id
+
+
+def test_store_round_trip(tmp_path):
+    store = ConversationStore(tmp_path / "conversations.db")
+    conversation_id = store.create("First question")
+    assert store.append(conversation_id, {'role': 'user', 'content': "Hi"}) == 1
+    assert store.append(conversation_id, {'role': 'assistant', 'content': "Hello", 'sources': ["p1"]}) == 2
+
+    messages = store.messages(conversation_id)
+    assert [(m['seq'], m['role'], m['content']) for m in messages] == [(1, 'user', "Hi"), (2, 'assistant', "Hello")]
+    assert messages[1]['sources'] == ["p1"]
+    assert [m['seq'] for m in store.messages(conversation_id, after_seq=1)] == [2]
+
+    store.set_summary(conversation_id, "Greetings", 2)
+    assert store.get(conversation_id)['summary'] == "Greetings"
+    assert store.get(conversation_id)['summarized_through'] == 2
+
+
+def test_store_drops_least_recent_conversations(tmp_path):
+    store = ConversationStore(tmp_path / "conversations.db", max_conversations=2)
+    first = store.create("one")
+    store.create("two")
+    store.create("three")
+    assert store.count() == 2
+    assert store.get(first) is None
+    assert store.messages(first) == []
+
+
+def test_short_history_is_kept_verbatim(tmp_path):
+    store = ConversationStore(tmp_path / "conversations.db")
+    llm = FakeLLM()
+    conversation_id = _conversation(store, turns=1)
+    history = ConversationMemory(store, llm, token_budget=200).history(conversation_id)
+    assert history == "User: Question 0 about attention heads?\nAssistant: Answer 0 citing two papers."
+    assert llm.calls == 0
+
+
+def test_compaction_stays_within_budget(tmp_path):
+    store = ConversationStore(tmp_path / "conversations.db")
+    llm = FakeLLM(summary=" ".join(["summary"] * 100))
+    conversation_id = _conversation(store)
+    memory = ConversationMemory(store, llm, token_budget=60)
+
+    history = memory.history(conversation_id)
+    assert TokenUtils.count_tokens(history) <= 60
+    assert history.startswith("Summary of earlier conversation: ")
+    assert history.endswith("Assistant: Answer 9 citing two papers.")
+    # The stored summary is capped at a third of the budget and covers the compacted turns
+    conversation = store.get(conversation_id)
+    assert TokenUtils.count_tokens(conversation['summary']) <= memory.summary_budget
+    assert conversation['summarized_through'] > 0
+
+
+def test_failed_compaction_backs_off_and_truncates(tmp_path):
+    store = ConversationStore(tmp_path / "conversations.db")
+    llm = FakeLLM(fail=True)
+    conversation_id = _conversation(store)
+    memory = ConversationMemory(store, llm, token_budget=60, compact_retry_seconds=300)
+
+    first = memory.history(conversation_id)
+    second = memory.history(conversation_id)
+    assert llm.calls == 1
+    assert first == second
+    assert TokenUtils.count_tokens(first) <= 60
+    assert "Question 0" not in first
+    assert store.get(conversation_id)['summarized_through'] == 0
+
+
+def test_error_replies_are_left_out_of_history(tmp_path):
+    store = ConversationStore(tmp_path / "conversations.db")
+    conversation_id = store.create("Question")
+    store.append(conversation_id, {'role': 'user', 'content': "What is attention?"})
+    store.append(conversation_id, {'role': 'assistant', 'content': f"{ERROR_PREFIX}: timeout", 'error': True})
+    history = ConversationMemory(store, FakeLLM(), token_budget=200).history(conversation_id)
+    assert history == "User: What is attention?"
@@ -0,0 +1,32 @@
+from datetime import date, timedelta
+from core.event_log import PAPER_ADDED, QUERY_MADE, EventLog
+
+
+def test_record_updates_daily_rollup(tmp_path):
+    log = EventLog(tmp_path / "events.db")
+    log.record(QUERY_MADE, duration_seconds=1.5, cached=False)
+    log.record(QUERY_MADE, duration_seconds=0.5, cached=True)
+    log.record(PAPER_ADDED, "p1")
+
+    today = log.daily_counts(days=1)
+    assert today == [{'day': date.today().isoformat(), 'events': {
+        QUERY_MADE: {'count': 2, 'total_seconds': 2.0},
+        PAPER_ADDED: {'count': 1, 'total_seconds': 0.0},
+    }}]
+    assert log.totals() == {QUERY_MADE: 2, PAPER_ADDED: 1}
+
+
+def test_daily_counts_fill_empty_days_and_ignore_other_days(tmp_path):
+    log = EventLog(tmp_path / "events.db")
+    log.record(QUERY_MADE)
+    with log.conn:
+        for offset in (-10, 1):
+            log.conn.execute(
+                "INSERT INTO daily_rollups (day, event_type, count, total_seconds) VALUES (?, ?, 5, 0)",
+                ((date.today() + timedelta(days=offset)).isoformat(), QUERY_MADE)
+            )
+
+    days = log.daily_counts(days=3)
+    assert [day['day'] for day in days] == [(date.today() - timedelta(days=i)).isoformat() for i in (2, 1, 0)]
+    assert [day['events'].get(QUERY_MADE, {}).get('count', 0) for day in days] == [0, 0, 1]
+    assert log.totals() == {QUERY_MADE: 11}
@@ -0,0 +1,37 @@
+import os
+from core.ingest_cache import IngestCache
+
+
+def test_content_hash_depends_only_on_bytes():
+    assert IngestCache.content_hash(b"pdf") == IngestCache.content_hash(b"pdf")
+    assert IngestCache.content_hash(b"pdf") != IngestCache.content_hash(b"pdf2")
+
+
+def test_store_blob_writes_once(tmp_path):
+    cache = IngestCache(tmp_path)
+    digest = IngestCache.content_hash(b"data")
+    path = cache.store_blob(digest, b"data", ".PDF")
+    assert path == cache.blob_path(digest, ".pdf")
+    assert path.read_bytes() == b"data"
+
+    mtime = os.stat(path).st_mtime_ns
+    assert cache.store_blob(digest, b"data", ".pdf") == path
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_record_round_trip(tmp_path):
+    cache = IngestCache(tmp_path)
+    digest = IngestCache.content_hash(b"data")
+    assert cache.get(digest) is None
+    cache.put(digest, {'id': "paper", 'page_count': 3})
+    assert cache.get(digest) == {'id': "paper", 'page_count': 3}
+    assert IngestCache(tmp_path).get(digest) == {'id': "paper", 'page_count': 3}
+
+
+def test_unreadable_record_is_ignored(tmp_path):
+    cache = IngestCache(tmp_path)
+    digest = IngestCache.content_hash(b"data")
+    cache.put(digest, {'id': "paper"})
+    sidecar = cache._sidecar_path(digest)
+    sidecar.write_text("{not json", encoding='utf-8')
+    assert cache.get(digest) is None
@@ -0,0 +1,42 @@
+from core.bulk_ingest import DONE, FAILED, IN_PROGRESS, PENDING, IngestManifest
+
+
+def test_add_pending_keeps_known_files(tmp_path):
+    manifest = IngestManifest(tmp_path / "manifest.db")
+    assert manifest.add_pending(["a.pdf", "b.pdf"]) == 2
+    manifest.set_status("a.pdf", DONE, paper_id="pa")
+    assert manifest.add_pending(["a.pdf", "b.pdf", "c.pdf"]) == 1
+    assert manifest.pending_paths() == ["b.pdf", "c.pdf"]
+
+
+def test_resume_after_crash(tmp_path):
+    path = tmp_path / "manifest.db"
+    manifest = IngestManifest(path)
+    manifest.add_pending(["a.pdf", "b.pdf", "c.pdf"])
+    manifest.set_status("a.pdf", IN_PROGRESS)
+    manifest.set_status("a.pdf", DONE, paper_id="pa")
+    manifest.set_status("b.pdf", IN_PROGRESS)
+    manifest.close()
+
+    # A new run picks up the file that was in progress when the previous one died, but not finished files
+    resumed = IngestManifest(path)
+    resumed.recover()
+    assert resumed.pending_paths() == ["b.pdf", "c.pdf"]
+    assert resumed.counts() == {DONE: 1, PENDING: 2}
+
+
+def test_recover_retries_failed_files_below_max_attempts(tmp_path):
+    manifest = IngestManifest(tmp_path / "manifest.db")
+    manifest.add_pending(["a.pdf", "b.pdf"])
+    for _ in range(3):
+        manifest.set_status("a.pdf", IN_PROGRESS)
+    manifest.set_status("a.pdf", FAILED, error="bad pdf")
+    manifest.set_status("b.pdf", IN_PROGRESS)
+    manifest.set_status("b.pdf", FAILED, error="timeout")
+
+    manifest.recover()
+    assert manifest.pending_paths() == []
+
+    manifest.recover(retry_failed=True, max_attempts=3)
+    assert manifest.pending_paths() == ["b.pdf"]
+    assert manifest.counts() == {FAILED: 1, PENDING: 1}
@@ -0,0 +1,109 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from core.job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue, JobWorkers
+
+
+def _status(queue, job_id):
+    return next(job['status'] for job in queue.recent() if job['id'] == job_id)
+
+
+def test_claim_takes_oldest_job(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    first = queue.enqueue("kind", {'n': 1})
+    queue.enqueue("kind", {'n': 2})
+    job = queue.claim("worker")
+    assert (job['id'], job['payload'], job['attempts']) == (first, {'n': 1}, 1)
+    assert _status(queue, first) == RUNNING
+
+
+def test_failed_job_is_retried_until_attempts_run_out(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=2)
+    job_id = queue.enqueue("kind", {})
+    queue.claim("worker")
+    queue.fail(job_id, "boom")
+    assert _status(queue, job_id) == QUEUED
+    queue.claim("worker")
+    queue.fail(job_id, "boom")
+    assert _status(queue, job_id) == FAILED
+
+    queue.retry(job_id)
+    assert queue.claim("worker")['attempts'] == 1
+
+
+def test_recover_only_requeues_jobs_of_silent_workers(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    orphaned = queue.enqueue("kind", {})
+    alive = queue.enqueue("kind", {})
+    queue.claim("dead-worker")
+    queue.claim("live-worker")
+    with queue.conn:
+        queue.conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE worker_id = ?", (time.time() - 60, "dead-worker"))
+
+    assert queue.recover(stale_after=30) == 1
+    assert _status(queue, orphaned) == QUEUED
+    assert _status(queue, alive) == RUNNING
+
+
+def test_prune_drops_old_finished_jobs(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db")
+    old = queue.enqueue("kind", {})
+    queued = queue.enqueue("kind", {})
+    queue.complete(old, {})
+    with queue.conn:
+        queue.conn.execute("UPDATE jobs SET updated_at = ?", ((datetime.now() - timedelta(days=30)).isoformat(),))
+
+    assert queue.prune(retention_days=7) == 1
+    assert [job['id'] for job in queue.recent()] == [queued]
+
+
+def test_workers_run_jobs_and_stop(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.db", max_attempts=2)
+    calls = []
+
+    def handler(payload, report_progress):
+        calls.append(payload['n'])
+        report_progress(0.5, "halfway")
+        if payload['n'] == 2 and calls.count(2) == 1:
+            raise RuntimeError("flaky")
+        return {'n': payload['n']}
+
+    ok = queue.enqueue("kind", {'n': 1})
+    flaky = queue.enqueue("kind", {'n': 2})
+    workers = JobWorkers(queue, {"kind": handler}, workers=1, poll_interval=0.01, heartbeat_interval=0.05)
+    deadline = time.monotonic() + 5
+    while queue.counts().get(DONE, 0) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    workers.stop(timeout=5)
+
+    assert queue.counts() == {DONE: 2}
+    assert calls == [1, 2, 2]
+    results = {job['id']: job for job in queue.recent()}
+    assert results[ok]['result'] == {'n': 1}
+    assert results[flaky]['attempts'] == 2
+    assert not any(thread.is_alive() for thread in workers.threads)
+
+
+def test_queues_sharing_a_file_never_claim_the_same_job(tmp_path):
+    path = tmp_path / "jobs.db"
+    producer = JobQueue(path)
+    for n in range(40):
+        producer.enqueue("kind", {'n': n})
+
+    claimed = []
+
+    def drain(worker_id):
+        # Each worker has its own connection, like a separate process
+        queue = JobQueue(path)
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                break
+            claimed.append(job['payload']['n'])
+
+    threads = [threading.Thread(target=drain, args=(f"worker-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == list(range(40))
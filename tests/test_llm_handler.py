@@ -0,0 +1,31 @@
+import pytest
+from fake_ollama import make_llm_handler
+
+
+@pytest.fixture
+def llm(tmp_path):
+    return make_llm_handler(tmp_path)
+
+
+def test_stream_holds_a_request_slot_until_it_ends(llm):
+    stream = llm.stream_response("What is attention?")
+    assert next(stream) == "Attention "
+    # Another request has to wait for the slot while the stream is still open
+    assert not llm._slots.acquire(blocking=False)
+    assert "".join(stream) == "is all you need"
+    assert llm._slots.acquire(blocking=False)
+    llm._slots.release()
+
+
+def test_closing_a_stream_early_releases_its_slot(llm):
+    stream = llm.stream_response("What is attention?")
+    next(stream)
+    stream.close()
+    assert llm._slots.acquire(blocking=False)
+    llm._slots.release()
+
+
+def test_streamed_answers_are_cached(llm):
+    assert "".join(llm.stream_response("What is attention?")) == "Attention is all you need"
+    assert "".join(llm.stream_response("What is attention?")) == "Attention is all you need"
+    assert llm.client.calls == 1
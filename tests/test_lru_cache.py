@@ -0,0 +1,41 @@
+import time
+from utils.lru_cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_put_replaces_existing_value():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("a", 2)
+    assert cache.get("a") == 2
+    assert cache.stats()['size'] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = LRUCache(max_size=2, ttl=0.01)
+    cache.put("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()['size'] == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+    cache.clear()
+    assert cache.get("a") is None
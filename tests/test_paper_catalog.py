@@ -0,0 +1,49 @@
+from core.paper_catalog import PaperCatalog
+
+
+def _catalog(tmp_path):
+    catalog = PaperCatalog(tmp_path / "catalog.db")
+    catalog.upsert([
+        ("p1", {'title': "Attention Is All You Need", 'filename': "attention.pdf", 'word_count': 9000,
+                'processed_at': "2024-01-01T00:00:00"}),
+        ("p2", {'title': "deep residual learning", 'filename': "resnet.pdf", 'word_count': 7000,
+                'processed_at': "2024-02-01T00:00:00"}),
+        ("p3", {'title': "BERT", 'filename': "bert_attention.pdf", 'word_count': 12000,
+                'processed_at': "2024-03-01T00:00:00"}),
+    ])
+    return catalog
+
+
+def test_search_matches_title_or_filename(tmp_path):
+    catalog = _catalog(tmp_path)
+    assert catalog.count() == 3
+    assert catalog.count("attention") == 2
+    assert catalog.count("missing") == 0
+
+
+def test_sort_orders(tmp_path):
+    catalog = _catalog(tmp_path)
+    ids = lambda sort: [paper['id'] for paper in catalog.page(sort=sort)]
+    assert ids('newest') == ["p3", "p2", "p1"]
+    assert ids('oldest') == ["p1", "p2", "p3"]
+    assert ids('title') == ["p1", "p3", "p2"]
+    assert ids('longest') == ["p3", "p1", "p2"]
+
+
+def test_paging(tmp_path):
+    catalog = _catalog(tmp_path)
+    first = catalog.page(sort='oldest', offset=0, limit=2)
+    second = catalog.page(sort='oldest', offset=2, limit=2)
+    assert [paper['id'] for paper in first + second] == ["p1", "p2", "p3"]
+    assert first[0]['metadata']['filename'] == "attention.pdf"
+
+
+def test_upsert_replaces_and_remove_deletes(tmp_path):
+    catalog = _catalog(tmp_path)
+    catalog.upsert([("p1", {'title': "Renamed"})])
+    assert catalog.count() == 3
+    assert catalog.count("Renamed") == 1
+    catalog.remove("p1")
+    assert catalog.count() == 2
+    catalog.clear()
+    assert catalog.count() == 0
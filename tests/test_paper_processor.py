@@ -0,0 +1,75 @@
+from concurrent.futures import Executor, Future
+import pytest
+import core.paper_processor as paper_processor_module
+from core.ingest_cache import IngestCache
+from core.paper_processor import PaperProcessor, _extract_page_range
+
+
+def _pdf(pages):
+    """Minimal PDF with one line of Helvetica text per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(pages))}] /Count {pages} >>".encode(),
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i in range(pages):
+        content = f"BT /F1 12 Tf 72 720 Td (Page {i} about attention) Tj ET".encode()
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * i} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>".encode())
+        objects.append(f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+    out, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    return out + f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+
+class InlineExecutor(Executor):
+    """Runs submitted calls immediately and records them"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append((fn, args))
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@pytest.fixture
+def make_processor(tmp_path, monkeypatch):
+    monkeypatch.setattr(paper_processor_module, 'IngestCache', lambda: IngestCache(tmp_path / "cache"))
+
+    def make(**kwargs):
+        executor = InlineExecutor()
+        return PaperProcessor(executor=executor, **kwargs), executor
+    return make
+
+
+def test_extract_page_range_defaults_to_every_page(tmp_path):
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(_pdf(3))
+    pages = _extract_page_range(str(path), 1)
+    assert [page_number for page_number, _, _ in pages] == [1, 2]
+    assert "Page 2 about attention" in pages[-1][1]
+
+
+def test_short_pdf_is_extracted_in_thread_by_default(make_processor):
+    processor, executor = make_processor()
+    result = processor.process_bytes("paper.pdf", _pdf(2))
+    assert result['success'] and result['extraction']['pages'] == 2
+    assert executor.submitted == []
+
+
+def test_extract_in_pool_sends_whole_file_to_the_pool(make_processor):
+    processor, executor = make_processor(extract_in_pool=True)
+    result = processor.process_bytes("paper.pdf", _pdf(2))
+    assert result['success'] and result['extraction']['pages'] == 2
+    assert "Page 1 about attention" in result['content']
+    assert [(fn, args[1:]) for fn, args in executor.submitted] == [(_extract_page_range, (0,))]
+
+    # A re-upload is served from the ingest cache without extracting again
+    assert processor.process_bytes("copy.pdf", _pdf(2))['cached']
+    assert len(executor.submitted) == 1
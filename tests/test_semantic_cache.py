@@ -0,0 +1,27 @@
+from core.semantic_cache import SemanticCache
+
+
+class UnreachableCollection:
+    """Collection whose every call fails the way an unreachable Chroma server does"""
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("Could not connect to Chroma")
+        return fail
+
+
+class FakeClient:
+    def get_or_create_collection(self, name, metadata):
+        return UnreachableCollection()
+
+
+def test_unreachable_chroma_is_logged_not_raised():
+    cache = SemanticCache(FakeClient())
+    assert cache.lookup("What is attention?", "scope", 1) is None
+    cache.store("What is attention?", "An answer", "scope", 1)
+    assert cache.stats() == {'entries': None, 'hits': 0, 'misses': 0, 'hit_rate': 0.0}
+
+
+def test_scope_key_ignores_paper_order():
+    assert SemanticCache.scope_key(["b", "a"], "model", 1) == SemanticCache.scope_key(["a", "b"], "model", 1)
+    assert SemanticCache.scope_key(["a"], "model", 1) != SemanticCache.scope_key(["a"], "model", 2)
@@ -0,0 +1,127 @@
+import pytest
+import core.vector_store as vector_store_module
+from core.event_log import EventLog
+from core.vector_store import VectorStore
+from fake_chroma import FakeClient
+
+
+def _paper(paper_id, chunk_count=2, text="attention transformers"):
+    return {'id': paper_id, 'chunks': [{
+        'id': f"{paper_id}_chunk_{i:04d}",
+        'content': f"{text} {paper_id} part {i}",
+        'metadata': {'paper_id': paper_id, 'chunk_index': i, 'title': paper_id.upper()}
+    } for i in range(chunk_count)]}
+
+
+@pytest.fixture
+def make_store(tmp_path, monkeypatch):
+    """Build VectorStores on a shared fake Chroma server; each data_dir stands for one host"""
+    client = FakeClient()
+    monkeypatch.setattr(vector_store_module, 'CHROMA_MODE', "http")
+    monkeypatch.setattr(vector_store_module, 'HYBRID_SEARCH', True)
+    monkeypatch.setattr(vector_store_module, 'get_event_log', lambda: EventLog(tmp_path / "events.db"))
+    monkeypatch.setattr(VectorStore, '_create_client', lambda self, mode: client)
+
+    def make(data_dir):
+        data_dir = tmp_path / data_dir
+        data_dir.mkdir(exist_ok=True)
+        monkeypatch.setattr(vector_store_module, 'DATA_DIR', data_dir)
+        monkeypatch.setattr(vector_store_module, 'PAPER_CATALOG_PATH', data_dir / "catalog.db")
+        monkeypatch.setattr(vector_store_module, 'BM25_INDEX_PATH', data_dir / "bm25.db")
+        return VectorStore()
+
+    make.client = client
+    return make
+
+
+def _keyword_hits(store, query):
+    return {chunk_id for chunk_id, _ in store.keyword_index.search(query)}
+
+
+def test_other_hosts_changes_are_replayed_without_a_rebuild(make_store, monkeypatch):
+    app = make_store("host_a")
+    other = make_store("host_b")
+    rebuilds = []
+    monkeypatch.setattr(app, '_backfill_keyword_index', lambda *args: rebuilds.append('keyword'))
+    monkeypatch.setattr(app, '_backfill_catalog', lambda *args: rebuilds.append('catalog'))
+
+    other.add_papers([_paper("p1"), _paper("p2")])
+    other.delete_paper("p1")
+    app.sync_local_indexes(force=True)
+
+    assert rebuilds == []
+    assert app.count() == 1
+    assert _keyword_hits(app, "p2") == {"p2_chunk_0000", "p2_chunk_0001"}
+    assert _keyword_hits(app, "p1") == set()
+
+
+def test_writes_by_another_local_process_are_not_replayed(make_store, monkeypatch):
+    # The app and the ingest CLI on one host share data/, including the keyword index
+    app = make_store("host")
+    cli = make_store("host")
+    replayed = []
+    monkeypatch.setattr(app, '_apply_changes', lambda changes: replayed.append(changes))
+    monkeypatch.setattr(app, '_backfill_keyword_index', lambda *args: replayed.append('rebuild'))
+
+    for n in range(5):
+        cli.add_paper(f"p{n}", _paper(f"p{n}")['chunks'])
+        app.sync_local_indexes(force=True)
+
+    assert replayed == []
+    assert app.count() == 5
+
+
+def test_host_too_far_behind_the_change_log_rebuilds(make_store, monkeypatch):
+    monkeypatch.setattr(vector_store_module, 'CHROMA_CHANGE_LOG_PAPERS', 2)
+    app = make_store("host_a")
+    other = make_store("host_b")
+    for n in range(4):
+        other.add_paper(f"p{n}", _paper(f"p{n}")['chunks'])
+
+    app.sync_local_indexes(force=True)
+    assert app.count() == 4
+    assert _keyword_hits(app, "p3") == {"p3_chunk_0000", "p3_chunk_0001"}
+
+
+def _adds(collection):
+    return [ids for call, ids in collection.calls if call == 'add']
+
+
+def test_rejected_chunk_is_isolated_by_bisection(make_store):
+    store = make_store("host")
+    good, bad = _paper("good", 4), _paper("bad", 4)
+    store.collection.rejected_ids = {"bad_chunk_0002"}
+
+    assert store.add_papers([good, bad]) == {"good": True, "bad": False}
+    assert store.last_write_stats['failed_ids'] == ["bad_chunk_0002"]
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1
+    assert [len(ids) for ids in _adds(store.collection)] == [8, 4, 4, 2, 2, 1, 1]
+    # The good paper is kept; the partially added paper is rolled back
+    assert sorted(store.collection.records) == [f"good_chunk_{i:04d}" for i in range(4)]
+    assert store.count() == 1
+
+
+def test_unreachable_chroma_fails_fast_after_max_retries(make_store, monkeypatch):
+    monkeypatch.setattr(vector_store_module, 'CHROMA_BATCH_SIZE', 2)
+    monkeypatch.setattr(vector_store_module, 'CHROMA_MAX_RETRIES', 3)
+    sleeps = []
+    monkeypatch.setattr(vector_store_module.time, 'sleep', sleeps.append)
+    store = make_store("host")
+    store.collection.unreachable = True
+
+    assert store.add_papers([_paper("p1", 6)]) == {"p1": False}
+    # Only the first batch is tried, with backoff between attempts but not after the last one
+    assert len(_adds(store.collection)) == 3
+    assert sleeps == [0.5, 1.0]
+    assert sorted(store.last_write_stats['failed_ids']) == [f"p1_chunk_{i:04d}" for i in range(6)]
+
+
+def test_failed_re_add_keeps_chunks_that_existed_before(make_store):
+    store = make_store("host")
+    assert store.add_paper("p1", _paper("p1", 2)['chunks'])
+    store.collection.rejected_ids = {"p1_chunk_0003"}
+
+    assert not store.add_paper("p1", _paper("p1", 4)['chunks'])
+    assert sorted(store.collection.records) == ["p1_chunk_0000", "p1_chunk_0001"]
+    assert ('delete', ["p1_chunk_0002"]) in store.collection.calls
+    assert {chunk_id for chunk_id, _ in store.keyword_index.search("p1")} == {"p1_chunk_0000", "p1_chunk_0001"}
@@ -0,0 +1,30 @@
+import re
+from typing import List, Tuple
+
+# Words, numbers and single punctuation marks each count as one token. This
+# tracks subword tokenizers closely enough for budgeting chunk sizes.
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+class TokenUtils:
+    @staticmethod
+    def count_tokens(text: str) -> int:
+        """Approximate the number of model tokens in text"""
+        if not text:
+            return 0
+        return len(TOKEN_PATTERN.findall(text))
+
+    @staticmethod
+    def token_spans(text: str) -> List[Tuple[int, int]]:
+        """Get (start, end) character offsets of each approximate token"""
+        return [match.span() for match in TOKEN_PATTERN.finditer(text)]
+
+    @staticmethod
+    def truncate(text: str, max_tokens: int) -> str:
+        """Cut text down to at most max_tokens approximate tokens"""
+        if max_tokens <= 0:
+            return ""
+        for i, match in enumerate(TOKEN_PATTERN.finditer(text)):
+            if i == max_tokens:
+                return text[:match.start()].rstrip()
+        return text